@@ -5,15 +5,33 @@ from __future__ import annotations
 
 import argparse
 import csv
+import functools
 import hashlib
 import json
+import mmap
+import os
 import re
 import subprocess
-from collections import Counter, defaultdict
+from collections import Counter, defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import BinaryIO, Callable, Deque, Dict, Iterable, Iterator, List, Pattern, Tuple, Union
 
+try:
+    import orjson
+except ImportError:  # optional accelerator; stdlib json is the fallback
+
+    def _dumps(value: object) -> bytes:
+        return json.dumps(value, indent=2).encode("utf-8")
+
+else:
+
+    def _dumps(value: object) -> bytes:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+Buffer = Union[bytes, mmap.mmap]
 
 INCLUDE_GLOBS = [
     "teams/**/*.md",
@@ -50,33 +68,215 @@ JSON_LIST_FIELDS = {
 
 ACTIVE_REQUEST_STATUSES = {"open", "in_progress", "blocked", "pending", "ready", "todo"}
 
+STAGES = ("blue", "red", "green", "black", "white", "grey", "qa_fixer")
+_SORTED_STAGES = tuple(sorted(STAGES))
+
+QA_LOG_BLOCK_SEP_RE = re.compile(r"\n---\n")
+QA_LOG_SCALAR_FIELDS = {"run_id", "timestamp_utc"}
+QA_LOG_LIST_FIELDS = {
+    "request_ids_implemented",
+    "decision_and_change_refs",
+    "files_changed",
+    "verification_evidence",
+    "residual_risks",
+}
+QA_LOG_BLOCK_FIELDS = QA_LOG_LIST_FIELDS | {"rationale"}
+
+GIT_LOG_ARGS = [
+    "git",
+    "log",
+    "-z",
+    "--date=iso-strict",
+    "--name-status",
+    "--pretty=format:%x1e%H%x1f%ad%x1f%an%x1f%s",
+]
+GIT_INCLUDED_PATHSPECS = [f":(glob){g}" for g in INCLUDE_GLOBS]
 
-def sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(65536), b""):
-            h.update(chunk)
-    return h.hexdigest()
+# Inventory digests and the manifest checksums are attestations consumed with
+# `sha256sum -c`, so the algorithm is fixed rather than swapped for a faster hash.
+HASH_ALGORITHM = "sha256"
+
+LOAD_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+MMAP_THRESHOLD = 1 << 20
+
+
+class HashingWriter:
+    """Binary file wrapper that SHA-256s everything written through it."""
+
+    def __init__(self, f: BinaryIO) -> None:
+        self.f = f
+        self.h = hashlib.sha256()
+
+    def write(self, data: bytes) -> None:
+        self.h.update(data)
+        self.f.write(data)
+
+    def hexdigest(self) -> str:
+        return self.h.hexdigest()
 
 
 def read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8")
 
 
-def read_csv(path: Path) -> Tuple[List[str], List[dict]]:
+def decode_text(data: Buffer) -> str:
+    # Match read_text(): universal newlines.
+    text = str(data, "utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def load_file(root: Path, path: Path) -> Tuple[dict, str]:
+    """Read `path` once and return its inventory entry and decoded text.
+
+    Files above MMAP_THRESHOLD are hashed and decoded straight from a
+    memory map instead of being copied into a bytes object first.
+    """
+    with path.open("rb") as f:
+        stat = os.fstat(f.fileno())
+        if stat.st_size > MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                digest = hashlib.sha256(mm).hexdigest()
+                text = decode_text(mm)
+        else:
+            data = f.read()
+            digest = hashlib.sha256(data).hexdigest()
+            text = decode_text(data)
+    entry = {
+        "path": path.relative_to(root).as_posix(),
+        "size_bytes": stat.st_size,
+        "mtime_utc": datetime.fromtimestamp(stat.st_mtime, timezone.utc).replace(microsecond=0).isoformat(),
+        "sha256": digest,
+    }
+    return entry, text
+
+
+def iter_file_contents(root: Path, files: List[Path], inventory: List[dict]) -> Iterator[Tuple[str, str]]:
+    """Yield `(rel, text)` in `files` order while worker threads read ahead.
+
+    At most `2 * LOAD_WORKERS` files are in flight, so memory stays bounded
+    even though the record is streamed.
+    """
+    remaining = iter(files)
+    with ThreadPoolExecutor(max_workers=LOAD_WORKERS) as ex:
+        pending: Deque[Future] = deque(
+            ex.submit(load_file, root, p) for p in islice(remaining, 2 * LOAD_WORKERS)
+        )
+        while pending:
+            entry, text = pending.popleft().result()
+            for p in islice(remaining, 1):
+                pending.append(ex.submit(load_file, root, p))
+            inventory.append(entry)
+            yield entry["path"], text
+
+
+def dumps_json(value: object, depth: int = 0) -> bytes:
+    """Serialize `value` as indent=2 JSON nested `depth` levels deep.
+
+    Uses orjson when it is installed. Its layout matches `json.dumps(indent=2)`,
+    except that non-ASCII text is written as UTF-8 rather than `\\u` escapes.
+    """
+    data = _dumps(value)
+    # Both encoders escape newlines inside strings, so every b"\n" here is layout.
+    return data.replace(b"\n", b"\n" + b"  " * depth) if depth else data
+
+
+def write_record(path: Path, record: dict, files: Iterable[Tuple[str, str]], trailer: dict) -> str:
+    """Stream `record`, a `files` map, then `trailer` to `path` and return its SHA-256.
+
+    The document matches `{**record, "files": dict(files), **trailer}` laid out with
+    indent=2, but only one file's text is held in memory at a time. `trailer` is
+    serialized after `files` is exhausted, so it may hold values filled in while streaming.
+    """
+    with path.open("wb") as f:
+        out = HashingWriter(f)
+        out.write(b"{")
+        for key, value in record.items():
+            out.write(b"\n  " + dumps_json(key) + b": " + dumps_json(value, 1) + b",")
+        out.write(b'\n  "files": {')
+        sep = b""
+        for rel, text in files:
+            out.write(sep + b"\n    " + dumps_json(rel) + b": " + dumps_json(text))
+            sep = b","
+        out.write(b"\n  }" if sep else b"}")
+        for key, value in trailer.items():
+            out.write(b",\n  " + dumps_json(key) + b": " + dumps_json(value, 1))
+        out.write(b"\n}\n")
+    return out.hexdigest()
+
+
+def read_csv(path: Path) -> Tuple[List[str], List[List[str]]]:
+    """Return the header and raw cell lists, skipping blank lines like csv.DictReader."""
     if not path.exists():
         return [], []
     with path.open("r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
-        return reader.fieldnames or [], list(reader)
+        reader = csv.reader(f)
+        header = next(reader, [])
+        return header, [row for row in reader if row]
+
+
+class EventTable:
+    """Raw rows of one event CSV; each stripped column is computed once and shared."""
+
+    def __init__(self, header: List[str], rows: List[List[str]]) -> None:
+        self.header = header
+        self.rows = rows
+        self._index = {name: i for i, name in enumerate(header)}
+        self._columns: Dict[str, List[str]] = {}
+
+    def column(self, field: str) -> List[str]:
+        """Each row's stripped `field` cell, or "" when the column or cell is missing."""
+        values = self._columns.get(field)
+        if values is None:
+            idx = self._index.get(field)
+            if idx is None:
+                values = [""] * len(self.rows)
+            else:
+                values = [row[idx].strip() if idx < len(row) else "" for row in self.rows]
+            self._columns[field] = values
+        return values
+
+
+def _compile_glob(pattern: str) -> Tuple[Pattern[str], str, bool]:
+    """Return (regex, literal directory prefix, descends below prefix) for a `Path.glob` pattern."""
+
+    def segment(seg: str) -> str:
+        return re.escape(seg).replace(r"\*", "[^/]*").replace(r"\?", "[^/]")
+
+    *dirs, name = pattern.split("/")
+    regex = "".join("(?:[^/]+/)*" if d == "**" else segment(d) + "/" for d in dirs) + segment(name)
+    literal = []
+    for d in dirs:
+        if "*" in d or "?" in d:
+            break
+        literal.append(d)
+    return re.compile(regex + r"\Z"), "/".join(literal), len(literal) < len(dirs)
+
+
+INCLUDE_GLOB_RES = [_compile_glob(g) for g in INCLUDE_GLOBS]
+
+
+def _may_contain_matches(rel_dir: str) -> bool:
+    for _, prefix, recursive in INCLUDE_GLOB_RES:
+        if rel_dir == prefix or prefix.startswith(rel_dir + "/"):
+            return True
+        if recursive and rel_dir.startswith(prefix + "/"):
+            return True
+    return False
 
 
 def gather_files(root: Path) -> List[Path]:
-    files = set()
-    for pattern in INCLUDE_GLOBS:
-        for p in root.glob(pattern):
-            if p.is_file():
-                files.add(p.resolve())
+    """Match INCLUDE_GLOBS in one walk, pruning directories no pattern can reach."""
+    files: List[Path] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = Path(dirpath).relative_to(root).as_posix()
+        base = "" if rel_dir == "." else rel_dir + "/"
+        dirnames[:] = [d for d in dirnames if _may_contain_matches(base + d)]
+        for name in filenames:
+            rel = base + name
+            if any(regex.match(rel) for regex, _, _ in INCLUDE_GLOB_RES):
+                files.append(root / rel)
     return sorted(files)
 
 
@@ -95,6 +295,10 @@ def parse_json_list(value: str) -> Tuple[List[str] | None, str | None]:
     return parsed, None
 
 
+# Queue cells repeat heavily ("[]", '["P1"]', ...). Cached lists are shared, so copy before use.
+_parse_json_list_cached = functools.lru_cache(maxsize=4096)(parse_json_list)
+
+
 def run_cmd(root: Path, args: List[str]) -> Tuple[bool, str]:
     try:
         p = subprocess.run(
@@ -112,10 +316,61 @@ def run_cmd(root: Path, args: List[str]) -> Tuple[bool, str]:
         return False, str(e)
 
 
+def iter_qa_log_blocks(md_text: str) -> Iterator[str]:
+    """Yield the non-empty, stripped blocks between `---` separator lines without building a list."""
+    start = 0
+    for m in QA_LOG_BLOCK_SEP_RE.finditer(md_text):
+        block = md_text[start:m.start()].strip()
+        if block:
+            yield block
+        start = m.end()
+    block = md_text[start:].strip()
+    if block:
+        yield block
+
+
+def run_stream(root: Path, args: List[str], sep: bytes) -> Iterator[bytes]:
+    """Yield stdout of `args` split on `sep` as it arrives; raise CalledProcessError on failure."""
+    with subprocess.Popen(args, cwd=root, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as p:
+        assert p.stdout is not None
+        stdout = p.stdout
+        tail = b""
+        for chunk in iter(lambda: stdout.read(65536), b""):
+            *records, tail = (tail + chunk).split(sep)
+            yield from records
+        if tail:
+            yield tail
+    if p.returncode != 0:
+        raise subprocess.CalledProcessError(p.returncode, args)
+
+
+def parse_git_log_record(record: bytes) -> dict:
+    # <hash>\x1f<date>\x1f<author>\x1f<subject>\n<status>\0<path>\0[<path>\0]...
+    fields = [t for t in record.decode("utf-8", errors="replace").split("\0") if t]
+    header, _, first_status = fields[0].partition("\n") if fields else ("", "", "")
+    parts = header.split("\x1f", 3)
+    parts += [""] * (4 - len(parts))
+    commit = {
+        "commit": parts[0],
+        "date_utc": parts[1],
+        "author": parts[2],
+        "subject": parts[3],
+        "files": [],
+    }
+    tokens = iter(([first_status] if first_status else []) + fields[1:])
+    for status in tokens:
+        # R (rename) and C (copy) entries carry source and destination paths.
+        paths = list(islice(tokens, 2 if status[:1] in ("R", "C") else 1))
+        if status.startswith("R") and len(paths) == 2:
+            commit["files"].append({"status": status, "path_old": paths[0], "path_new": paths[1]})
+        elif paths:
+            commit["files"].append({"status": status, "path": paths[0]})
+    return commit
+
+
 def parse_qa_fix_log(md_text: str) -> List[dict]:
     entries: List[dict] = []
-    blocks = [b.strip() for b in md_text.split("\n---\n") if b.strip()]
-    for b in blocks:
+    for b in iter_qa_log_blocks(md_text):
         if "- run_id:" not in b:
             continue
         current: dict = {
@@ -128,47 +383,40 @@ def parse_qa_fix_log(md_text: str) -> List[dict]:
             "verification_evidence": [],
             "residual_risks": [],
         }
+        rationale_parts: List[str] = []
         mode = None
         for raw in b.splitlines():
             line = raw.rstrip()
-            if line.startswith("- run_id:"):
-                current["run_id"] = line.split(":", 1)[1].strip()
-                mode = None
-            elif line.startswith("- timestamp_utc:"):
-                current["timestamp_utc"] = line.split(":", 1)[1].strip()
-                mode = None
-            elif line.startswith("- request_ids_implemented:"):
-                mode = "request_ids_implemented"
-            elif line.startswith("- decision_and_change_refs:"):
-                mode = "decision_and_change_refs"
-            elif line.startswith("- files_changed:"):
-                mode = "files_changed"
-            elif line.startswith("- rationale:"):
-                mode = "rationale"
-            elif line.startswith("- verification_evidence:"):
-                mode = "verification_evidence"
-            elif line.startswith("- residual_risks:"):
-                mode = "residual_risks"
-            elif mode == "rationale":
-                if line.strip().startswith("|"):
+            if line.startswith("- "):
+                key, sep, rest = line[2:].partition(":")
+                if sep and key in QA_LOG_SCALAR_FIELDS:
+                    current[key] = rest.strip()
+                    mode = None
+                    continue
+                if sep and key in QA_LOG_BLOCK_FIELDS:
+                    mode = key
                     continue
-                if line.strip().startswith("- "):
+            s = line.strip()
+            if mode == "rationale":
+                if s.startswith("|"):
+                    continue
+                if s.startswith("- "):
                     mode = None
-                elif line.strip():
-                    current["rationale"] += (line.strip() + " ")
-            elif mode in {"request_ids_implemented", "decision_and_change_refs", "files_changed", "verification_evidence", "residual_risks"}:
-                s = line.strip()
+                elif s:
+                    rationale_parts.append(s)
+            elif mode is not None:
                 if s.startswith("- "):
                     current[mode].append(s[2:].strip())
-        current["rationale"] = current["rationale"].strip()
+        current["rationale"] = " ".join(rationale_parts)
         entries.append(current)
     return entries
 
 
-def collect_git_change_evidence(root: Path) -> dict:
+def collect_git_change_evidence(root: Path, included_paths_only: bool = False) -> dict:
     evidence = {
         "git_available": False,
         "branch": "",
+        "log_pathspecs": GIT_INCLUDED_PATHSPECS if included_paths_only else [],
         "commit_history": [],
         "worktree_status_porcelain": [],
         "worktree_changed_files": [],
@@ -185,39 +433,20 @@ def collect_git_change_evidence(root: Path) -> dict:
     if ok:
         evidence["branch"] = out.strip()
 
-    ok, out = run_cmd(
-        root,
-        ["git", "log", "--date=iso-strict", "--name-status", "--pretty=format:@@%H|%ad|%an|%s"],
-    )
-    if ok:
-        commits = []
-        current = None
-        for line in out.splitlines():
-            if line.startswith("@@"):
-                if current:
-                    commits.append(current)
-                parts = line[2:].split("|", 3)
-                current = {
-                    "commit": parts[0] if len(parts) > 0 else "",
-                    "date_utc": parts[1] if len(parts) > 1 else "",
-                    "author": parts[2] if len(parts) > 2 else "",
-                    "subject": parts[3] if len(parts) > 3 else "",
-                    "files": [],
-                }
-            elif current and line.strip():
-                # examples: M\tpath, A\tpath, R100\told\tnew
-                parts = line.split("\t")
-                if len(parts) >= 2:
-                    status = parts[0].strip()
-                    if status.startswith("R") and len(parts) >= 3:
-                        current["files"].append(
-                            {"status": status, "path_old": parts[1], "path_new": parts[2]}
-                        )
-                    else:
-                        current["files"].append({"status": status, "path": parts[1]})
-        if current:
-            commits.append(current)
-        evidence["commit_history"] = commits
+    log_args = GIT_LOG_ARGS
+    if included_paths_only:
+        # Changed-path Bloom filters let git skip commits that cannot match the pathspecs.
+        run_cmd(root, ["git", "commit-graph", "write", "--reachable", "--changed-paths"])
+        log_args = GIT_LOG_ARGS + ["--", *GIT_INCLUDED_PATHSPECS]
+
+    try:
+        evidence["commit_history"] = [
+            parse_git_log_record(rec)
+            for rec in run_stream(root, log_args, b"\x1e")
+            if rec
+        ]
+    except (OSError, subprocess.CalledProcessError):
+        pass
 
     ok, out = run_cmd(root, ["git", "status", "--porcelain", "-uall"])
     if ok:
@@ -240,87 +469,140 @@ def collect_git_change_evidence(root: Path) -> dict:
     return evidence
 
 
-def normalize_rows(file_key: str, rows: List[dict], issues: List[dict]) -> List[dict]:
+def add_issue(issues: List[dict], severity_counts: Counter, issue: dict) -> None:
+    """Record `issue` and count its severity so the summary never rescans `issues`."""
+    issues.append(issue)
+    severity_counts[issue.get("severity", "unknown")] += 1
+
+
+def normalize_rows(
+    file_key: str,
+    header: List[str],
+    rows: List[List[str]],
+    issues: List[dict],
+    severity_counts: Counter,
+) -> List[dict]:
     out: List[dict] = []
+    width = len(header)
+    json_fields = [k for k in dict.fromkeys(header) if k in JSON_LIST_FIELDS]
     for i, row in enumerate(rows, start=1):
-        nr = dict(row)
+        # Same shape csv.DictReader produced: extras under None, missing cells as None.
+        nr: dict = dict(zip(header, row))
+        if len(row) > width:
+            nr[None] = row[width:]
+        elif len(row) < width:
+            for k in header[len(row):]:
+                nr[k] = None
         nr["_row_number"] = i
-        for k, v in list(nr.items()):
-            if k in JSON_LIST_FIELDS:
-                parsed, err = parse_json_list(str(v or ""))
-                if err is None:
-                    nr[k] = parsed
-                else:
-                    nr[f"{k}_raw"] = v
-                    issues.append(
-                        {
-                            "severity": "error",
-                            "code": "JSON_FIELD_INVALID",
-                            "file": file_key,
-                            "row_number": i,
-                            "field": k,
-                            "message": err,
-                        }
-                    )
+        for k in json_fields:
+            v = nr[k]
+            raw = str(v or "")
+            if raw == "" or raw == "[]":
+                nr[k] = []
+                continue
+            parsed, err = _parse_json_list_cached(raw)
+            if err is None:
+                nr[k] = list(parsed or [])
+            else:
+                nr[f"{k}_raw"] = v
+                add_issue(
+                    issues,
+                    severity_counts,
+                    {
+                        "severity": "error",
+                        "code": "JSON_FIELD_INVALID",
+                        "file": file_key,
+                        "row_number": i,
+                        "field": k,
+                        "message": err,
+                    }
+                )
         out.append(nr)
     return out
 
 
+def _run_uid(row: dict, r: object) -> str:
+    return f"run|{row.get('run_id','')}|{row.get('created_utc','')}|{row.get('status','')}|row:{r}"
+
+
+def _change_request_uid(row: dict, r: object) -> str:
+    return f"cr|{row.get('run_id','')}|{row.get('request_id','')}|row:{r}"
+
+
+def _handoff_uid(row: dict, r: object) -> str:
+    return (
+        f"handoff|{row.get('run_id','')}|{row.get('timestamp_utc','')}|"
+        f"{row.get('from_team','')}->{row.get('to_team','')}|entry:{row.get('entry_id','')}|row:{r}"
+    )
+
+
+def _decision_uid(row: dict, r: object) -> str:
+    return (
+        f"decision|{row.get('run_id','')}|{row.get('timestamp_utc','')}|"
+        f"{row.get('decision_id','')}|row:{r}"
+    )
+
+
+UID_BUILDERS: Dict[str, Callable[[dict, object], str]] = {
+    "run_registry.csv": _run_uid,
+    "change_request_queue.csv": _change_request_uid,
+    "handoff_log.csv": _handoff_uid,
+    "decision_log.csv": _decision_uid,
+}
+
+
 def make_uid(file_key: str, row: dict) -> str:
     r = row.get("_row_number", "?")
-    if file_key.endswith("run_registry.csv"):
-        return f"run|{row.get('run_id','')}|{row.get('created_utc','')}|{row.get('status','')}|row:{r}"
-    if file_key.endswith("change_request_queue.csv"):
-        return f"cr|{row.get('run_id','')}|{row.get('request_id','')}|row:{r}"
-    if file_key.endswith("handoff_log.csv"):
-        return (
-            f"handoff|{row.get('run_id','')}|{row.get('timestamp_utc','')}|"
-            f"{row.get('from_team','')}->{row.get('to_team','')}|entry:{row.get('entry_id','')}|row:{r}"
-        )
-    if file_key.endswith("decision_log.csv"):
-        return (
-            f"decision|{row.get('run_id','')}|{row.get('timestamp_utc','')}|"
-            f"{row.get('decision_id','')}|row:{r}"
-        )
+    builder = UID_BUILDERS.get(file_key.rsplit("/", 1)[-1])
+    if builder is not None:
+        return builder(row, r)
     return f"event|{file_key}|row:{r}"
 
 
-def validate_duplicates(file_key: str, rows: List[dict], id_field: str, issues: List[dict]) -> None:
+def validate_duplicates(
+    file_key: str,
+    table: EventTable,
+    id_field: str,
+    issues: List[dict],
+    severity_counts: Counter,
+) -> None:
     seen: Dict[str, int] = {}
-    for row in rows:
-        value = str(row.get(id_field, "") or "").strip()
+    for rn, value in enumerate(table.column(id_field), start=1):
         if not value:
             continue
         if value in seen:
-            issues.append(
+            add_issue(
+                issues,
+                severity_counts,
                 {
                     "severity": "error",
                     "code": "DUPLICATE_ID",
                     "file": file_key,
                     "field": id_field,
-                    "row_number": row.get("_row_number"),
+                    "row_number": rn,
                     "message": f"duplicate {id_field}='{value}' (first seen row {seen[value]})",
                 }
             )
         else:
-            seen[value] = int(row.get("_row_number", 0))
+            seen[value] = rn
 
 
 def validate_supersedes(
     file_key: str,
-    rows: List[dict],
+    table: EventTable,
     current_field: str,
     supersedes_field: str,
     issues: List[dict],
+    severity_counts: Counter,
 ) -> None:
     seen_prior: set[str] = set()
-    for row in rows:
-        current = str(row.get(current_field, "") or "").strip()
-        supers = str(row.get(supersedes_field, "") or "").strip()
-        rn = row.get("_row_number")
+    pairs = zip(table.column(current_field), table.column(supersedes_field))
+    for rn, (current, supers) in enumerate(pairs, start=1):
         if supers:
             if supers == current:
-                issues.append(
+                add_issue(
+                    issues,
+                    severity_counts,
                     {
                         "severity": "error",
                         "code": "SUPERSEDES_SELF",
@@ -331,7 +613,9 @@ def validate_supersedes(
                     }
                 )
             elif supers not in seen_prior:
-                issues.append(
+                add_issue(
+                    issues,
+                    severity_counts,
                     {
                         "severity": "error",
                         "code": "SUPERSEDES_TARGET_NOT_PRIOR",
@@ -345,17 +629,21 @@ def validate_supersedes(
             seen_prior.add(current)
 
 
-def materialize_latest(rows: List[dict], key_field: str) -> Dict[str, dict]:
+def materialize_latest(rows: List[dict], keys: List[str]) -> Dict[str, dict]:
     latest: Dict[str, dict] = {}
-    for row in rows:
-        key = str(row.get(key_field, "") or "").strip()
+    for key, row in zip(keys, rows):
         if not key:
             continue
         latest[key] = row
     return latest
 
 
-def build_summary(current: dict, events: dict, issues: List[dict]) -> dict:
+def build_summary(
+    current: dict,
+    tables: Dict[str, EventTable],
+    issues: List[dict],
+    severity_counts: Counter,
+) -> dict:
     current_runs = current.get("runs", {})
     current_requests = current.get("change_requests", {})
     current_handoffs = current.get("handoffs", {})
@@ -364,24 +652,16 @@ def build_summary(current: dict, events: dict, issues: List[dict]) -> dict:
     for row in current_runs.values():
         run_status_counts[str(row.get("status", "") or "unknown")] += 1
 
+    stages_by_run: Dict[str, set] = defaultdict(set)
+    handoffs = tables["data/team_ops/handoff_log.csv"]
+    for run_id, src in zip(handoffs.column("run_id"), handoffs.column("from_team")):
+        if src in STAGES:
+            stages_by_run[run_id].add(src)
+
     stage_completion = {}
     for run_id in current_runs.keys():
-        completion = {
-            "blue": False,
-            "red": False,
-            "green": False,
-            "black": False,
-            "white": False,
-            "grey": False,
-            "qa_fixer": False,
-        }
-        for row in events.get("data/team_ops/handoff_log.csv", []):
-            if str(row.get("run_id", "") or "").strip() != run_id:
-                continue
-            src = str(row.get("from_team", "") or "").strip()
-            if src in completion:
-                completion[src] = True
-        stage_completion[run_id] = completion
+        done = stages_by_run.get(run_id, set())
+        stage_completion[run_id] = {stage: stage in done for stage in STAGES}
 
     open_p1_by_assignee = defaultdict(list)
     for req_id, row in current_requests.items():
@@ -405,8 +685,6 @@ def build_summary(current: dict, events: dict, issues: List[dict]) -> dict:
                 }
             )
 
-    severity_counts = Counter(i.get("severity", "unknown") for i in issues)
-
     return {
         "run_summary": {
             "total_runs": len(current_runs),
@@ -423,6 +701,11 @@ def build_summary(current: dict, events: dict, issues: List[dict]) -> dict:
     }
 
 
+def format_stage_completion(stages: dict) -> str:
+    # Same text as json.dumps(stages, sort_keys=True) for the fixed STAGES keys.
+    return "{" + ", ".join(f'"{s}": ' + ("true" if stages[s] else "false") for s in _SORTED_STAGES) + "}"
+
+
 def build_markdown_summary(summary: dict, generated_utc: str, execution_changes: dict) -> str:
     lines = [
         "# Oracle Record Summary",
@@ -437,7 +720,7 @@ def build_markdown_summary(summary: dict, generated_utc: str, execution_changes:
         "## Stage Completion",
     ]
     for run_id, stages in summary["stage_completion_map"].items():
-        lines.append(f"- {run_id}: {json.dumps(stages, sort_keys=True)}")
+        lines.append(f"- {run_id}: {format_stage_completion(stages)}")
 
     lines.extend(["", "## Open P1 By Assignee"])
     if summary["open_p1_by_assignee"]:
@@ -476,6 +759,11 @@ def build_markdown_summary(summary: dict, generated_utc: str, execution_changes:
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Export Oracle-ready team history record.")
     p.add_argument("--strict", action="store_true", help="Fail export when integrity issues are found.")
+    p.add_argument(
+        "--git-included-paths-only",
+        action="store_true",
+        help="Limit git commit history to paths matching the included globs (faster on deep histories).",
+    )
     return p.parse_args()
 
 
@@ -491,50 +779,46 @@ def main() -> int:
 
     files = gather_files(root)
 
-    inventory = []
-    file_contents: Dict[str, str] = {}
-    for p in files:
-        rel = p.relative_to(root).as_posix()
-        digest = sha256_file(p)
-        stat = p.stat()
-        inventory.append(
-            {
-                "path": rel,
-                "size_bytes": stat.st_size,
-                "mtime_utc": datetime.fromtimestamp(stat.st_mtime, timezone.utc).replace(microsecond=0).isoformat(),
-                "sha256": digest,
-            }
-        )
-        file_contents[rel] = read_text(p)
+    inventory: List[dict] = []
 
     issues: List[dict] = []
+    severity_counts: Counter = Counter()
     events: Dict[str, List[dict]] = {}
-    headers: Dict[str, List[str]] = {}
 
+    tables: Dict[str, EventTable] = {}
     for rel in CSV_EVENT_FILES:
         h, r = read_csv(root / rel)
-        headers[rel] = h
-        normalized = normalize_rows(rel, r, issues)
+        tables[rel] = EventTable(h, r)
+        normalized = normalize_rows(rel, h, r, issues, severity_counts)
         for row in normalized:
             row["_event_uid"] = make_uid(rel, row)
         events[rel] = normalized
 
-    validate_duplicates("data/team_ops/handoff_log.csv", events.get("data/team_ops/handoff_log.csv", []), "entry_id", issues)
-    validate_duplicates("data/team_ops/decision_log.csv", events.get("data/team_ops/decision_log.csv", []), "decision_id", issues)
+    for rel, id_field in (
+        ("data/team_ops/handoff_log.csv", "entry_id"),
+        ("data/team_ops/decision_log.csv", "decision_id"),
+    ):
+        validate_duplicates(rel, tables[rel], id_field, issues, severity_counts)
 
-    validate_supersedes("data/team_ops/run_registry.csv", events.get("data/team_ops/run_registry.csv", []), "run_id", "supersedes_run_id", issues)
-    validate_supersedes("data/team_ops/change_request_queue.csv", events.get("data/team_ops/change_request_queue.csv", []), "request_id", "supersedes_request_id", issues)
-    validate_supersedes("data/team_ops/handoff_log.csv", events.get("data/team_ops/handoff_log.csv", []), "entry_id", "supersedes_entry_id", issues)
-    validate_supersedes("data/team_ops/decision_log.csv", events.get("data/team_ops/decision_log.csv", []), "decision_id", "supersedes_decision_id", issues)
+    for rel, current_field, supersedes_field in (
+        ("data/team_ops/run_registry.csv", "run_id", "supersedes_run_id"),
+        ("data/team_ops/change_request_queue.csv", "request_id", "supersedes_request_id"),
+        ("data/team_ops/handoff_log.csv", "entry_id", "supersedes_entry_id"),
+        ("data/team_ops/decision_log.csv", "decision_id", "supersedes_decision_id"),
+    ):
+        validate_supersedes(rel, tables[rel], current_field, supersedes_field, issues, severity_counts)
 
     current = {
-        "runs": materialize_latest(events.get("data/team_ops/run_registry.csv", []), "run_id"),
-        "change_requests": materialize_latest(events.get("data/team_ops/change_request_queue.csv", []), "request_id"),
-        "handoffs": materialize_latest(events.get("data/team_ops/handoff_log.csv", []), "entry_id"),
-        "decisions": materialize_latest(events.get("data/team_ops/decision_log.csv", []), "decision_id"),
+        name: materialize_latest(events[rel], tables[rel].column(key_field))
+        for name, rel, key_field in (
+            ("runs", "data/team_ops/run_registry.csv", "run_id"),
+            ("change_requests", "data/team_ops/change_request_queue.csv", "request_id"),
+            ("handoffs", "data/team_ops/handoff_log.csv", "entry_id"),
+            ("decisions", "data/team_ops/decision_log.csv", "decision_id"),
+        )
     }
 
-    summary = build_summary(current, events, issues)
+    summary = build_summary(current, tables, issues, severity_counts)
 
     qa_fix_log_path = root / "pipeline" / "07_qa_fix_log.md"
     qa_fix_log_entries = parse_qa_fix_log(read_text(qa_fix_log_path)) if qa_fix_log_path.exists() else []
@@ -546,7 +830,7 @@ def main() -> int:
             if item.strip()
         }
     )
-    git_evidence = collect_git_change_evidence(root)
+    git_evidence = collect_git_change_evidence(root, included_paths_only=args.git_included_paths_only)
 
     execution_changes = {
         "qa_fixer_log_entries": qa_fix_log_entries,
@@ -572,6 +856,7 @@ def main() -> int:
             "description": "Comprehensive machine-readable record of teams work since inception",
             "included_globs": INCLUDE_GLOBS,
             "event_csv_files": CSV_EVENT_FILES,
+            "hash_algorithm": HASH_ALGORITHM,
         },
         "integrity": {
             "strict_mode": bool(args.strict),
@@ -583,25 +868,28 @@ def main() -> int:
         "execution_changes": execution_changes,
         "events": events,
         "current": current,
-        "inventory": inventory,
-        "files": file_contents,
     }
 
     record_path = export_dir / "oracle_record.json"
-    record_path.write_text(json.dumps(record, indent=2) + "\n", encoding="utf-8")
+    record_sha256 = write_record(
+        record_path,
+        record,
+        iter_file_contents(root, files, inventory),
+        {"inventory": inventory},
+    )
 
     summary_md_path = export_dir / "oracle_record.md"
-    summary_md_path.write_text(
-        build_markdown_summary(summary, generated_utc, execution_changes) + "\n",
-        encoding="utf-8",
-    )
+    with summary_md_path.open("wb") as f:
+        summary_out = HashingWriter(f)
+        summary_out.write((build_markdown_summary(summary, generated_utc, execution_changes) + "\n").encode("utf-8"))
 
     manifest = {
         "generated_utc": generated_utc,
         "record_path": str(record_path.relative_to(root)),
         "summary_path": str(summary_md_path.relative_to(root)),
-        "record_sha256": sha256_file(record_path),
-        "summary_sha256": sha256_file(summary_md_path),
+        "record_sha256": record_sha256,
+        "summary_sha256": summary_out.hexdigest(),
+        "hash_algorithm": HASH_ALGORITHM,
         "included_file_count": len(files),
         "inventory_entries": len(inventory),
         "integrity_ok": len(issues) == 0,
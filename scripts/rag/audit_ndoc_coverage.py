@@ -4,9 +4,14 @@
 from __future__ import annotations
 
 import argparse
-import json
+from itertools import compress, islice
 from pathlib import Path
 
+try:
+    from orjson import loads
+except ImportError:  # optional accelerator; stdlib json is the fallback
+    from json import loads  # type: ignore[assignment]
+
 
 def is_public_decl(doc_row: dict) -> bool:
     return doc_row.get("visibility") == "public"
@@ -26,28 +31,32 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    rows = json.loads(Path(args.index).read_text(encoding="utf-8"))
-    considered = [row for row in rows if is_public_decl(row)]
-    documented = [row for row in considered if row.get("has_ndoc")]
-    undocumented = [row for row in considered if not row.get("has_ndoc")]
+    rows = loads(Path(args.index).read_bytes())
+    # Column views over the index; counts are sums, rows are only touched for the report.
+    is_public = [is_public_decl(row) for row in rows]
+    has_ndoc = [bool(row.get("has_ndoc")) for row in rows]
+    considered = sum(is_public)
+    documented = sum(compress(has_ndoc, is_public))
+    undocumented = considered - documented
+    missing = compress(rows, [pub and not doc for pub, doc in zip(is_public, has_ndoc)])
 
     pct = 0.0
     if considered:
-        pct = (len(documented) / len(considered)) * 100.0
+        pct = (documented / considered) * 100.0
 
     lines = [
         "# NDOC Coverage Audit",
         "",
-        f"- Declarations considered: {len(considered)}",
-        f"- With NDOC: {len(documented)}",
-        f"- Without NDOC: {len(undocumented)}",
+        f"- Declarations considered: {considered}",
+        f"- With NDOC: {documented}",
+        f"- Without NDOC: {undocumented}",
         f"- Coverage: {pct:.2f}%",
         "",
         "## Missing NDOC",
         "",
     ]
 
-    for row in undocumented[:300]:
+    for row in islice(missing, 300):
         lines.append(f"- `{row['kind']} {row['name']}` at `{row['file']}:{row['line']}`")
 
     out = Path(args.output)
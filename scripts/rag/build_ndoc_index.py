@@ -5,63 +5,80 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 DECL_RE = re.compile(
-    r"^\s*(pub(?:\([^)]+\))?\s+)?(?:async\s+)?(fn|struct|enum|trait|mod|type)\s+([A-Za-z_][A-Za-z0-9_]*)"
+    r"^[^\S\n]*(pub(?:\([^)\n]+\))?[^\S\n]+)?(?:async[^\S\n]+)?(fn|struct|enum|trait|mod|type)[^\S\n]+([A-Za-z_][A-Za-z0-9_]*)",
+    re.MULTILINE,
 )
 
 
+def doc_lines_before(text: str, pos: int) -> list[str]:
+    """Collect `///` lines above the line starting at `pos`.
+
+    Blank lines, plain `//` comments and attributes like #[derive(...)] keep the
+    doc block attached; any other line ends it.
+    """
+    docs: list[str] = []
+    end = pos - 1
+    while end >= 0:
+        start = text.rfind("\n", 0, end) + 1
+        stripped = text[start:end].strip()
+        if stripped.startswith("///"):
+            docs.append(stripped[3:].strip())
+        elif stripped and not stripped.startswith(("//", "#[")):
+            break
+        end = start - 1
+    docs.reverse()
+    return docs
+
+
 def parse_rust_file(path: Path) -> list[dict[str, Any]]:
-    lines = path.read_text(encoding="utf-8").splitlines()
+    text = "\n".join(path.read_text(encoding="utf-8").splitlines())
     out: list[dict[str, Any]] = []
-    pending_docs: list[str] = []
+    line_no = 1
+    scanned = 0
+
+    for decl in DECL_RE.finditer(text):
+        line_no += text.count("\n", scanned, decl.start())
+        scanned = decl.start()
+        vis, kind, name = decl.groups()
+        doc_text = "\n".join(doc_lines_before(text, decl.start())).strip()
+        has_ndoc = "NDOC" in doc_text
+        out.append(
+            {
+                "file": str(path),
+                "line": line_no,
+                "kind": kind,
+                "name": name,
+                "visibility": "public" if vis else "private",
+                "has_ndoc": has_ndoc,
+                "doc": doc_text,
+            }
+        )
 
-    for i, line in enumerate(lines, start=1):
-        stripped = line.strip()
+    return out
 
-        if stripped.startswith("///"):
-            pending_docs.append(stripped[3:].strip())
-            continue
-
-        # Keep doc comments attached across Rust attributes like #[derive(...)].
-        if stripped.startswith("#[") and pending_docs:
-            continue
-
-        decl = DECL_RE.match(line)
-        if decl:
-            vis, kind, name = decl.groups()
-            doc_text = "\n".join(pending_docs).strip()
-            has_ndoc = "NDOC" in doc_text
-            out.append(
-                {
-                    "file": str(path),
-                    "line": i,
-                    "kind": kind,
-                    "name": name,
-                    "visibility": "public" if vis else "private",
-                    "has_ndoc": has_ndoc,
-                    "doc": doc_text,
-                }
-            )
-            pending_docs = []
-            continue
-
-        if stripped and not stripped.startswith("//"):
-            pending_docs = []
 
-    return out
+def _walk_rust_files(directory: Path) -> Iterator[Path]:
+    with os.scandir(directory) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from _walk_rust_files(Path(entry.path))
+        elif entry.name.endswith(".rs") and entry.is_file():
+            yield Path(entry.path)
 
 
-def collect_rust_files(roots: list[Path]) -> list[Path]:
-    files: list[Path] = []
+def iter_rust_files(roots: list[Path]) -> Iterator[Path]:
+    """Yield `*.rs` files under each root in the order `sorted(root.rglob("*.rs"))` gives."""
     for root in roots:
-        if not root.exists():
-            continue
-        files.extend(sorted(root.rglob("*.rs")))
-    return files
+        if root.is_dir():
+            yield from _walk_rust_files(root)
 
 
 def main() -> None:
@@ -77,14 +94,25 @@ def main() -> None:
         default="planning/reports/ndoc_index.json",
         help="Path to write JSON index output.",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for parsing (1 parses in-process).",
+    )
     args = parser.parse_args()
 
     roots = [Path(p) for p in args.roots]
-    files = collect_rust_files(roots)
+    files = iter_rust_files(roots)
 
     index: list[dict[str, Any]] = []
-    for path in files:
-        index.extend(parse_rust_file(path))
+    if args.jobs <= 1:
+        for path in files:
+            index.extend(parse_rust_file(path))
+    else:
+        with ProcessPoolExecutor(max_workers=args.jobs) as ex:
+            for decls in ex.map(parse_rust_file, files, chunksize=8):
+                index.extend(decls)
 
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -4,42 +4,46 @@
 from __future__ import annotations
 
 import argparse
-import json
 from collections import defaultdict
 from pathlib import Path
 from typing import Any
 
+try:
+    from orjson import loads
+except ImportError:  # optional accelerator; stdlib json is the fallback
+    from json import loads  # type: ignore[assignment]
 
-def extract_component(doc: str) -> str:
-    for line in doc.splitlines():
-        if line.startswith("component:"):
-            return line.split(":", 1)[1].strip().strip("`")
-    return "undocumented"
-
-
-def extract_purpose(doc: str) -> str:
-    for line in doc.splitlines():
-        if line.startswith("purpose:"):
-            return line.split(":", 1)[1].strip()
-    return ""
 
+def parse_ndoc(doc: str) -> tuple[str, str, list[str]]:
+    """Return ``(component, purpose, invariants)`` from a single pass over ``doc``.
 
-def extract_invariants(doc: str) -> list[str]:
-    lines = doc.splitlines()
-    out: list[str] = []
+    The first ``component:``/``purpose:`` line wins. Invariants are the list
+    items following the first ``invariants:`` line, up to the next unindented
+    ``key:`` line.
+    """
+    component: str | None = None
+    purpose: str | None = None
+    invariants: list[str] = []
     in_block = False
-    for line in lines:
-        if line.startswith("invariants:"):
-            in_block = True
-            continue
-        if in_block:
-            if line.startswith("-"):
-                out.append(line.lstrip("-").strip())
-            elif line.startswith("  -"):
-                out.append(line.lstrip(" -").strip())
-            elif line and ":" in line and not line.startswith("  "):
-                break
-    return out
+    block_done = False
+    for line in doc.splitlines():
+        if not block_done:
+            if line.startswith("invariants:"):
+                in_block = True
+            elif in_block:
+                if line.startswith("-"):
+                    invariants.append(line.lstrip("-").strip())
+                elif line.startswith("  -"):
+                    invariants.append(line.lstrip(" -").strip())
+                elif line and ":" in line and not line.startswith("  "):
+                    block_done = True
+        if component is None and line.startswith("component:"):
+            component = line.partition(":")[2].strip().strip("`")
+        elif purpose is None and line.startswith("purpose:"):
+            purpose = line.partition(":")[2].strip()
+    if component is None:
+        component = "undocumented"
+    return component, purpose or "", invariants
 
 
 def main() -> None:
@@ -57,42 +61,35 @@ def main() -> None:
     args = parser.parse_args()
 
     index_path = Path(args.index)
-    rows: list[dict[str, Any]] = json.loads(index_path.read_text(encoding="utf-8"))
+    rows: list[dict[str, Any]] = loads(index_path.read_bytes())
 
-    by_component: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    by_component: dict[str, list[tuple[dict[str, Any], str, list[str]]]] = defaultdict(list)
     ndoc_count = 0
     for row in rows:
-        doc = row.get("doc", "")
         if row.get("has_ndoc"):
             ndoc_count += 1
-        by_component[extract_component(doc)].append(row)
-
-    lines: list[str] = []
-    lines.append("# NDOC Summary Report")
-    lines.append("")
-    lines.append(f"- Total declarations indexed: {len(rows)}")
-    lines.append(f"- Declarations with NDOC: {ndoc_count}")
-    lines.append("")
-
-    for component in sorted(by_component):
-        entries = by_component[component]
-        lines.append(f"## {component}")
-        lines.append("")
-        for entry in entries:
-            purpose = extract_purpose(entry.get("doc", ""))
-            invariants = extract_invariants(entry.get("doc", ""))
-            file_ref = f"{entry['file']}:{entry['line']}"
-            lines.append(
-                f"- `{entry['kind']} {entry['name']}` ({file_ref})"
-                + (f" - {purpose}" if purpose else "")
-            )
-            for inv in invariants:
-                lines.append(f"  - invariant: {inv}")
-        lines.append("")
+        component, purpose, invariants = parse_ndoc(row.get("doc", ""))
+        by_component[component].append((row, purpose, invariants))
 
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text("\n".join(lines), encoding="utf-8")
+    # Every section ends with a blank line; it is written as the leading "\n" of
+    # the next section so the report ends right after the last entry.
+    with output_path.open("w", encoding="utf-8") as out:
+        out.write("# NDOC Summary Report\n\n")
+        out.write(f"- Total declarations indexed: {len(rows)}\n")
+        out.write(f"- Declarations with NDOC: {ndoc_count}\n")
+
+        for component, entries in sorted(by_component.items()):
+            out.write(f"\n## {component}\n\n")
+            for entry, purpose, invariants in entries:
+                out.write(f"- `{entry['kind']} {entry['name']}` ({entry['file']}:{entry['line']})")
+                if purpose:
+                    out.write(f" - {purpose}")
+                out.write("\n")
+                for inv in invariants:
+                    out.write(f"  - invariant: {inv}\n")
+
     print(f"Wrote summary to {output_path}")
 
 
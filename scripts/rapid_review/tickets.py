@@ -5,10 +5,12 @@ from __future__ import annotations
 
 import argparse
 import csv
-from dataclasses import dataclass
+import re
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator, NamedTuple, Sequence
 
 ROOT = Path(__file__).resolve().parents[2]
 LOG_DIR = ROOT / "planning" / "RAPID_REVIEW_CELL" / "logs"
@@ -18,6 +20,9 @@ DECISION_DISPOSITION_PATH = LOG_DIR / "DECISION_DISPOSITION.csv"
 TICKET_QUEUE_PATH = LOG_DIR / "TICKET_QUEUE.csv"
 TICKET_RESPONSES_PATH = LOG_DIR / "TICKET_RESPONSES.csv"
 
+# RRC-<YYYYMMDD>-<index>; the index is zero-padded to three digits but may grow past 999.
+_TICKET_ID_RE = re.compile(r"RRC-([0-9]{8})-([0-9]+)")
+
 TICKET_QUEUE_FIELDS = [
     "row_id",
     "ts_utc",
@@ -52,8 +57,7 @@ TICKET_RESPONSE_FIELDS = [
 ]
 
 
-@dataclass
-class TicketSeed:
+class TicketSeed(NamedTuple):
     review_run_id: str
     artifact_id: str
     artifact_version: str
@@ -75,6 +79,34 @@ def read_csv(path: Path) -> list[dict[str, str]]:
         return list(csv.DictReader(handle))
 
 
+def read_csv_cols(path: Path, cols: Sequence[str]) -> Iterator[tuple[str | None, ...]]:
+    """Yield the ``cols`` of every row of ``path`` without building per-row dicts.
+
+    Matches what ``DictReader`` plus ``row.get(col, "")`` would give: blank lines
+    are skipped, cells missing from short rows are None and columns absent from
+    the header are "".
+    """
+    if not path.exists():
+        return
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            return
+        # Later duplicates win, as they do in a DictReader row.
+        positions = {name: i for i, name in enumerate(header)}
+        idx = [positions.get(col, -1) for col in cols]
+        width = max(idx) + 1
+        getter = itemgetter(*idx) if len(idx) > 1 and -1 not in idx else None
+        for row in reader:
+            if not row:
+                continue
+            if getter is not None and len(row) >= width:
+                yield getter(row)
+            else:
+                yield tuple("" if i < 0 else row[i] if i < len(row) else None for i in idx)
+
+
 def ensure_csv(path: Path, headers: list[str]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     if path.exists():
@@ -84,18 +116,54 @@ def ensure_csv(path: Path, headers: list[str]) -> None:
         writer.writeheader()
 
 
+def _scan_queue(path: Path, date_part: str = "") -> tuple[int, int]:
+    """Return ``(max_row_id, max_ticket_index)`` for ``path`` in a single pass.
+
+    The ticket index only counts well-formed ticket ids dated ``date_part``;
+    with no date it is always 0.
+    """
+    max_row_id = 0
+    max_idx = 0
+    match_ticket_id = _TICKET_ID_RE.fullmatch
+    for row_id, ticket_id in read_csv_cols(path, ("row_id", "ticket_id")):
+        try:
+            max_row_id = max(max_row_id, int(row_id))  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            pass
+        if date_part and ticket_id:
+            m = match_ticket_id(ticket_id)
+            if m and m.group(1) == date_part:
+                max_idx = max(max_idx, int(m.group(2)))
+    return max_row_id, max_idx
+
+
 def next_row_id(path: Path) -> int:
-    rows = read_csv(path)
-    if not rows:
-        return 1
-    return max(int(row["row_id"]) for row in rows if row.get("row_id", "").isdigit()) + 1
+    return _scan_queue(path)[0] + 1
 
 
-def append_row(path: Path, headers: list[str], row: dict[str, Any]) -> None:
-    ensure_csv(path, headers)
+@contextmanager
+def open_append(path: Path, headers: list[str]) -> Iterator[csv.DictWriter[str]]:
+    """Yield a DictWriter appending to ``path`` through one open handle.
+
+    The header is written when the file is new (or empty). Missing fields are
+    written as "" and keys outside ``headers`` are ignored.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("a", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(handle, fieldnames=headers)
-        writer.writerow({k: row.get(k, "") for k in headers})
+        writer = csv.DictWriter(handle, fieldnames=headers, restval="", extrasaction="ignore")
+        if handle.tell() == 0:
+            writer.writeheader()
+        yield writer
+
+
+def append_rows(path: Path, headers: list[str], rows: list[dict[str, Any]]) -> None:
+    """Append ``rows`` with a single open/write/close of ``path``."""
+    with open_append(path, headers) as writer:
+        writer.writerows(rows)
+
+
+def append_row(path: Path, headers: list[str], row: dict[str, Any]) -> None:
+    append_rows(path, headers, [row])
 
 
 def normalize_bool(value: str) -> str:
@@ -116,31 +184,41 @@ def claim_by_run(rows: list[dict[str, str]], review_run_id: str) -> dict[str, di
 
 
 def latest_status_by_ticket() -> dict[str, str]:
+    """Map each queued ticket to its latest status.
+
+    Only the newest response with a ``status_after`` matters per ticket, so the
+    append-only responses log is walked newest-first and the walk stops once
+    every queued ticket has been resolved. Responses for tickets that are not
+    in the queue are ignored.
+    """
     status: dict[str, str] = {}
-    for row in read_csv(TICKET_QUEUE_PATH):
-        ticket_id = row.get("ticket_id")
+    for ticket_id, ticket_status in read_csv_cols(TICKET_QUEUE_PATH, ("ticket_id", "status")):
         if ticket_id:
-            status[ticket_id] = row.get("status", "open") or "open"
-    for row in read_csv(TICKET_RESPONSES_PATH):
-        ticket_id = row.get("ticket_id")
-        if ticket_id and row.get("status_after"):
-            status[ticket_id] = row["status_after"]
+            status[ticket_id] = ticket_status or "open"
+    responses = list(read_csv_cols(TICKET_RESPONSES_PATH, ("ticket_id", "status_after")))
+    seen: set[str] = set()
+    for ticket_id, status_after in reversed(responses):
+        if ticket_id and status_after and ticket_id in status and ticket_id not in seen:
+            status[ticket_id] = status_after
+            seen.add(ticket_id)
+            if len(seen) == len(status):
+                break
     return status
 
 
+def ticket_exists(ticket_id: str) -> bool:
+    """Stream the queue and stop at the first row for ``ticket_id``."""
+    return any(row_ticket_id == ticket_id for (row_ticket_id,) in read_csv_cols(TICKET_QUEUE_PATH, ("ticket_id",)))
+
+
+def ticket_date_part() -> str:
+    return datetime.now(tz=timezone.utc).strftime("%Y%m%d")
+
+
 def next_ticket_id() -> str:
-    rows = read_csv(TICKET_QUEUE_PATH)
-    date_part = datetime.now(tz=timezone.utc).strftime("%Y%m%d")
-    prefix = f"RRC-{date_part}-"
-    max_idx = 0
-    for row in rows:
-        ticket_id = row.get("ticket_id", "")
-        if ticket_id.startswith(prefix):
-            try:
-                max_idx = max(max_idx, int(ticket_id.split("-")[-1]))
-            except ValueError:
-                continue
-    return f"{prefix}{max_idx + 1:03d}"
+    date_part = ticket_date_part()
+    _, max_idx = _scan_queue(TICKET_QUEUE_PATH, date_part)
+    return f"RRC-{date_part}-{max_idx + 1:03d}"
 
 
 def create_ticket(args: argparse.Namespace) -> None:
@@ -167,19 +245,19 @@ def create_ticket(args: argparse.Namespace) -> None:
 
 
 def build_ticket_seeds_from_review(review_run_id: str) -> list[TicketSeed]:
-    decisions = [
-        row for row in read_csv(DECISION_DISPOSITION_PATH) if row.get("review_run_id") == review_run_id
-    ]
-    if not decisions:
+    latest_decision: dict[str, str] | None = None
+    for row in read_csv(DECISION_DISPOSITION_PATH):
+        if row.get("review_run_id") == review_run_id:
+            latest_decision = row
+    if latest_decision is None:
         raise ValueError(f"No decision rows found for review_run_id={review_run_id}")
 
-    latest_decision = decisions[-1]
     outcome = latest_decision.get("outcome", "")
     if outcome in {"approved_as_is"}:
         return []
 
     claims = claim_by_run(read_csv(CLAIM_REGISTER_PATH), review_run_id)
-    evidence_rows = [row for row in read_csv(EVIDENCE_SUPPORT_PATH) if row.get("review_run_id") == review_run_id]
+    evidence_rows = (row for row in read_csv(EVIDENCE_SUPPORT_PATH) if row.get("review_run_id") == review_run_id)
 
     seeds: list[TicketSeed] = []
     for row in evidence_rows:
@@ -217,40 +295,49 @@ def from_review(args: argparse.Namespace) -> None:
         print(f"No tickets required for review_run_id={args.review_run_id}")
         return
 
+    # Scan the queue once and number the new tickets locally from there; the
+    # whole batch shares one creation timestamp.
+    date_part = ticket_date_part()
+    row_id, idx = _scan_queue(TICKET_QUEUE_PATH, date_part)
+    ts_utc = now_utc_iso()
     created = 0
-    for seed in seeds:
-        ticket_id = next_ticket_id()
-        row = {
-            "row_id": next_row_id(TICKET_QUEUE_PATH),
-            "ts_utc": now_utc_iso(),
-            "ticket_id": ticket_id,
-            "review_run_id": seed.review_run_id,
-            "artifact_id": seed.artifact_id,
-            "artifact_version": seed.artifact_version,
-            "claim_id": seed.claim_id,
-            "priority": seed.priority,
-            "status": "open",
-            "title": seed.title,
-            "requested_change": seed.requested_change,
-            "acceptance_criteria": seed.acceptance_criteria,
-            "owner_team": args.owner_team,
-            "opened_by": args.opened_by,
-            "supersedes_row_id": "",
-        }
-        append_row(TICKET_QUEUE_PATH, TICKET_QUEUE_FIELDS, row)
-        created += 1
-        print(f"Created ticket {ticket_id} for claim {seed.claim_id}")
+    with open_append(TICKET_QUEUE_PATH, TICKET_QUEUE_FIELDS) as writer:
+        for seed in seeds:
+            row_id += 1
+            idx += 1
+            ticket_id = f"RRC-{date_part}-{idx:03d}"
+            row = {
+                "row_id": row_id,
+                "ts_utc": ts_utc,
+                "ticket_id": ticket_id,
+                "review_run_id": seed.review_run_id,
+                "artifact_id": seed.artifact_id,
+                "artifact_version": seed.artifact_version,
+                "claim_id": seed.claim_id,
+                "priority": seed.priority,
+                "status": "open",
+                "title": seed.title,
+                "requested_change": seed.requested_change,
+                "acceptance_criteria": seed.acceptance_criteria,
+                "owner_team": args.owner_team,
+                "opened_by": args.opened_by,
+                "supersedes_row_id": "",
+            }
+            writer.writerow(row)
+            created += 1
+            print(f"Created ticket {ticket_id} for claim {seed.claim_id}")
 
     print(f"Created {created} ticket(s) from review run {args.review_run_id}")
 
 
 def respond(args: argparse.Namespace) -> None:
-    queue = read_csv(TICKET_QUEUE_PATH)
-    if not any(row.get("ticket_id") == args.ticket_id for row in queue):
+    if not ticket_exists(args.ticket_id):
         raise ValueError(f"Unknown ticket_id={args.ticket_id}")
 
-    response_rows = read_csv(TICKET_RESPONSES_PATH)
-    response_id = f"{args.ticket_id}-R{len([r for r in response_rows if r.get('ticket_id') == args.ticket_id]) + 1:02d}"
+    response_count = sum(
+        1 for (ticket_id,) in read_csv_cols(TICKET_RESPONSES_PATH, ("ticket_id",)) if ticket_id == args.ticket_id
+    )
+    response_id = f"{args.ticket_id}-R{response_count + 1:02d}"
     row = {
         "row_id": next_row_id(TICKET_RESPONSES_PATH),
         "ts_utc": now_utc_iso(),
@@ -270,27 +357,19 @@ def respond(args: argparse.Namespace) -> None:
 
 
 def list_tickets(args: argparse.Namespace) -> None:
-    queue = read_csv(TICKET_QUEUE_PATH)
+    queue = list(
+        read_csv_cols(TICKET_QUEUE_PATH, ("ticket_id", "status", "priority", "owner_team", "claim_id", "title"))
+    )
     if not queue:
         print("No tickets found.")
         return
     status_by_ticket = latest_status_by_ticket()
     rows = []
-    for row in queue:
-        ticket_id = row.get("ticket_id", "")
-        current_status = status_by_ticket.get(ticket_id, row.get("status", "open"))
+    for ticket_id, status, priority, owner_team, claim_id, title in queue:
+        current_status = status_by_ticket.get(ticket_id or "", status)
         if args.status and current_status != args.status:
             continue
-        rows.append(
-            (
-                ticket_id,
-                current_status,
-                row.get("priority", ""),
-                row.get("owner_team", ""),
-                row.get("claim_id", ""),
-                row.get("title", ""),
-            )
-        )
+        rows.append((ticket_id, current_status, priority, owner_team, claim_id, title))
 
     if not rows:
         print("No tickets match the requested filters.")
@@ -9,34 +9,37 @@ import json
 import shutil
 import sys
 from collections import defaultdict
-from dataclasses import dataclass
 from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Sequence, Set, Tuple
-
-
-ACTIVE_RUN_STATUSES_DEFAULT = {
-    "initialized",
-    "active",
-    "in_progress",
-    "blocked",
-    "blocked_missing_stages",
-    "awaiting_input",
-    "ready",
-}
-
-ACTIVE_REQUEST_STATUSES_DEFAULT = {
-    "open",
-    "in_progress",
-    "blocked",
-    "ready",
-    "todo",
-    "pending",
-}
-
-
-@dataclass
-class SplitResult:
+from typing import AbstractSet, Callable, Dict, FrozenSet, Iterator, List, NamedTuple, Sequence, Set, Tuple
+
+
+ACTIVE_RUN_STATUSES_DEFAULT: FrozenSet[str] = frozenset(
+    {
+        "initialized",
+        "active",
+        "in_progress",
+        "blocked",
+        "blocked_missing_stages",
+        "awaiting_input",
+        "ready",
+    }
+)
+
+ACTIVE_REQUEST_STATUSES_DEFAULT: FrozenSet[str] = frozenset(
+    {
+        "open",
+        "in_progress",
+        "blocked",
+        "ready",
+        "todo",
+        "pending",
+    }
+)
+
+
+class SplitResult(NamedTuple):
     keep: List[dict]
     archive: List[dict]
 
@@ -51,6 +54,22 @@ def _read_csv(path: Path) -> Tuple[List[str], List[dict]]:
     return header, rows
 
 
+def _read_csv_column(path: Path, field: str) -> Iterator[str | None]:
+    """Yield one column of ``path`` per row, skipping blank lines like DictReader.
+
+    Cells missing from short rows are None; an absent column yields None for
+    every row.
+    """
+    with path.open("r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        # Later duplicates win, as they do in a DictReader row.
+        idx = {name: i for i, name in enumerate(header)}.get(field, -1)
+        for row in reader:
+            if row:
+                yield row[idx] if 0 <= idx < len(row) else None
+
+
 def _write_csv(path: Path, header: Sequence[str], rows: Sequence[dict]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp = path.with_suffix(path.suffix + ".tmp")
@@ -65,13 +84,27 @@ def _normalize(value: str | None) -> str:
     return (value or "").strip().lower()
 
 
+def _fields_getter(rows: Sequence[dict], *fields: str) -> Callable[[dict], tuple]:
+    """Return a callable pulling ``fields`` (two or more) out of a row as a tuple.
+
+    DictReader gives every row the same header keys, so when the first row has
+    all of ``fields`` a single ``itemgetter`` call does the work; otherwise the
+    missing columns read as None, like ``row.get``.
+    """
+    if not rows or all(field in rows[0] for field in fields):
+        return itemgetter(*fields)
+    return lambda row: tuple(row.get(field) for field in fields)
+
+
 def _latest_run_rows(rows: Sequence[dict]) -> Dict[str, dict]:
     latest: Dict[str, dict] = {}
+    get_fields = _fields_getter(rows, "run_id", "created_utc")
     for row in rows:
-        run_id = (row.get("run_id") or "").strip()
+        run_id, created_utc = get_fields(row)
+        run_id = (run_id or "").strip()
         if not run_id:
             continue
-        ts = (row.get("created_utc") or "").strip()
+        ts = (created_utc or "").strip()
         prev = latest.get(run_id)
         if prev is None or ts >= (prev.get("created_utc") or ""):
             latest[run_id] = row
@@ -80,7 +113,7 @@ def _latest_run_rows(rows: Sequence[dict]) -> Dict[str, dict]:
 
 def _split_run_registry(
     rows: Sequence[dict],
-    active_run_statuses: Set[str],
+    active_run_statuses: AbstractSet[str],
     keep_run_history: bool,
 ) -> Tuple[SplitResult, Set[str]]:
     latest = _latest_run_rows(rows)
@@ -90,51 +123,100 @@ def _split_run_registry(
         if _normalize(row.get("status")) in active_run_statuses
     }
 
-    if keep_run_history:
-        keep = [r for r in rows if (r.get("run_id") or "").strip() in active_runs]
-    else:
-        keep = [latest[run_id] for run_id in sorted(active_runs)]
-
-    keep_keys = {id(r) for r in keep}
-    archive = [r for r in rows if id(r) not in keep_keys]
+    # Latest-only output is ordered by run id rather than by file position, so
+    # the loop below only has to collect kept rows when history is retained.
+    keep: List[dict] = [] if keep_run_history else [latest[run_id] for run_id in sorted(active_runs)]
+    archive: List[dict] = []
+    for r in rows:
+        run_id = (r.get("run_id") or "").strip()
+        if run_id not in active_runs:
+            archive.append(r)
+        elif keep_run_history:
+            keep.append(r)
+        elif r is not latest[run_id]:
+            archive.append(r)
     return SplitResult(keep=keep, archive=archive), active_runs
 
 
-def _split_by_active_runs(rows: Sequence[dict], active_runs: Set[str]) -> SplitResult:
-    keep: List[dict] = []
-    archive: List[dict] = []
-    for row in rows:
-        run_id = (row.get("run_id") or "").strip()
-        if run_id and run_id in active_runs:
-            keep.append(row)
-        else:
-            archive.append(row)
-    return SplitResult(keep=keep, archive=archive)
+def _stream_split_by_active_runs(
+    path: Path,
+    active_runs: Set[str],
+    archive_path: Path | None,
+) -> Tuple[int, int]:
+    """Partition ``path`` by run in a single pass and return ``(keep, archive)`` counts.
+
+    Rows are written straight to temp files without materializing the log:
+    kept rows replace ``path`` and archived rows land in ``archive_path`` (only
+    if there are any). With ``archive_path=None`` only the run_id column is
+    read and the rows are just counted.
+    """
+    kept = archived = 0
+    is_active = active_runs.__contains__
+    if archive_path is None:
+        for run_id in _read_csv_column(path, "run_id"):
+            run_id = (run_id or "").strip()
+            if run_id and is_active(run_id):
+                kept += 1
+            else:
+                archived += 1
+        return kept, archived
+
+    with path.open("r", encoding="utf-8", newline="") as src:
+        reader = csv.DictReader(src)
+        header = reader.fieldnames or []
+        keep_tmp = path.with_suffix(path.suffix + ".tmp")
+        archive_tmp = path.with_suffix(path.suffix + ".archive.tmp")
+        with keep_tmp.open("w", encoding="utf-8", newline="") as keep_f, archive_tmp.open(
+            "w", encoding="utf-8", newline=""
+        ) as archive_f:
+            keep_writer = csv.DictWriter(keep_f, fieldnames=header, extrasaction="ignore")
+            archive_writer = csv.DictWriter(archive_f, fieldnames=header, extrasaction="ignore")
+            keep_writer.writeheader()
+            archive_writer.writeheader()
+            for row in reader:
+                run_id = (row.get("run_id") or "").strip()
+                if run_id and is_active(run_id):
+                    keep_writer.writerow(row)
+                    kept += 1
+                else:
+                    archive_writer.writerow(row)
+                    archived += 1
+
+    keep_tmp.replace(path)
+    if archived:
+        archive_path.parent.mkdir(parents=True, exist_ok=True)
+        archive_tmp.replace(archive_path)
+    else:
+        archive_tmp.unlink()
+    return kept, archived
 
 
 def _split_change_requests(
     rows: Sequence[dict],
     active_runs: Set[str],
-    active_request_statuses: Set[str],
+    active_request_statuses: AbstractSet[str],
 ) -> SplitResult:
     superseded_ids = {
-        (r.get("supersedes_request_id") or "").strip()
-        for r in rows
-        if (r.get("supersedes_request_id") or "").strip()
+        sup for r in rows if (sup := (r.get("supersedes_request_id") or "").strip())
     }
 
+    # Neither active_runs nor superseded_ids ever holds "", so blank ids simply
+    # miss the lookups below.
+    is_active_request_status = active_request_statuses.__contains__
+    is_active_run_id = active_runs.__contains__
+    is_superseded_id = superseded_ids.__contains__
+
+    get_fields = _fields_getter(rows, "request_id", "run_id", "status")
+
     keep: List[dict] = []
     archive: List[dict] = []
     for row in rows:
-        request_id = (row.get("request_id") or "").strip()
-        run_id = (row.get("run_id") or "").strip()
-        status = _normalize(row.get("status"))
-
-        is_active_status = status in active_request_statuses
-        is_active_run = run_id in active_runs if run_id else False
-        is_superseded = request_id in superseded_ids if request_id else False
-
-        if is_active_status and is_active_run and not is_superseded:
+        request_id, run_id, status = get_fields(row)
+        if (
+            is_active_request_status((status or "").strip().lower())
+            and is_active_run_id((run_id or "").strip())
+            and not is_superseded_id((request_id or "").strip())
+        ):
             keep.append(row)
         else:
             archive.append(row)
@@ -143,6 +225,12 @@ def _split_change_requests(
 
 
 def _copy_as_backup(src: Path, backup_dir: Path) -> None:
+    """Snapshot ``src`` into ``backup_dir``.
+
+    This is a real copy, not a hardlink: if a rewrite fails before its
+    ``replace``, the living log keeps its inode and later appends to it would
+    otherwise change the backup too.
+    """
     backup_dir.mkdir(parents=True, exist_ok=True)
     shutil.copy2(src, backup_dir / src.name)
 
@@ -160,9 +248,9 @@ def _archive_rows(
     return out
 
 
-def _parse_set(value: str, default: Set[str]) -> Set[str]:
+def _parse_set(value: str, default: FrozenSet[str]) -> AbstractSet[str]:
     if not value.strip():
-        return set(default)
+        return default
     return {_normalize(v) for v in value.split(",") if v.strip()}
 
 
@@ -218,10 +306,16 @@ def main() -> int:
     active_run_statuses = _parse_set(args.active_run_statuses, ACTIVE_RUN_STATUSES_DEFAULT)
     active_request_statuses = _parse_set(args.active_request_statuses, ACTIVE_REQUEST_STATUSES_DEFAULT)
 
+    # run_registry and change_request_queue need whole-file passes (latest row
+    # per run, superseded request ids); the larger handoff/decision logs only
+    # need the active run set and are partitioned as they are streamed.
+    materialized = ("run_registry.csv", "change_request_queue.csv")
+    streamed = ("handoff_log.csv", "decision_log.csv")
+
     headers: Dict[str, List[str]] = {}
     rows: Dict[str, List[dict]] = {}
-    for name, path in required_files.items():
-        h, r = _read_csv(path)
+    for name in materialized:
+        h, r = _read_csv(required_files[name])
         headers[name] = h
         rows[name] = r
 
@@ -235,29 +329,56 @@ def main() -> int:
         active_runs=active_runs,
         active_request_statuses=active_request_statuses,
     )
-    handoff_split = _split_by_active_runs(rows["handoff_log.csv"], active_runs)
-    decision_split = _split_by_active_runs(rows["decision_log.csv"], active_runs)
-
     split_map = {
         "run_registry.csv": run_split,
         "change_request_queue.csv": req_split,
-        "handoff_log.csv": handoff_split,
-        "decision_log.csv": decision_split,
     }
 
+    counts: Dict[str, Tuple[int, int]] = {
+        name: (len(split.keep), len(split.archive)) for name, split in split_map.items()
+    }
+    archived_files: List[str] = []
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    timestamp_utc = now.isoformat()
+
+    if args.dry_run:
+        for name in streamed:
+            counts[name] = _stream_split_by_active_runs(required_files[name], active_runs, None)
+    else:
+        timestamp = now.strftime("%Y%m%dT%H%M%SZ")
+        archive_dir = data_dir / "archive" / timestamp
+        backup_dir = archive_dir / "backup"
+        archive_csv_dir = archive_dir / "archived_rows"
+
+        for name, path in required_files.items():
+            _copy_as_backup(path, backup_dir)
+
+        for name, path in required_files.items():
+            if name in split_map:
+                split = split_map[name]
+                _write_csv(path, headers[name], split.keep)
+                archived = _archive_rows(archive_csv_dir, name, headers[name], split.archive)
+            else:
+                archived = archive_csv_dir / name
+                counts[name] = _stream_split_by_active_runs(path, active_runs, archived)
+                if not counts[name][1]:
+                    archived = None
+            if archived:
+                archived_files.append(str(archived))
+
     summary = {
-        "timestamp_utc": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+        "timestamp_utc": timestamp_utc,
         "dry_run": args.dry_run,
         "active_run_ids": sorted(active_runs),
         "active_run_statuses": sorted(active_run_statuses),
         "active_request_statuses": sorted(active_request_statuses),
         "counts": {
             name: {
-                "before": len(rows[name]),
-                "keep": len(split_map[name].keep),
-                "archive": len(split_map[name].archive),
+                "before": counts[name][0] + counts[name][1],
+                "keep": counts[name][0],
+                "archive": counts[name][1],
             }
-            for name in split_map
+            for name in required_files
         },
     }
 
@@ -265,27 +386,12 @@ def main() -> int:
         print(json.dumps(summary, indent=2))
         return 0
 
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-    archive_dir = data_dir / "archive" / timestamp
-    backup_dir = archive_dir / "backup"
-    archive_csv_dir = archive_dir / "archived_rows"
-
     archive_manifest = {
         **summary,
         "archive_dir": str(archive_dir),
-        "archived_files": [],
+        "archived_files": archived_files,
     }
 
-    for name, path in required_files.items():
-        _copy_as_backup(path, backup_dir)
-
-    for name, path in required_files.items():
-        split = split_map[name]
-        _write_csv(path, headers[name], split.keep)
-        archived = _archive_rows(archive_csv_dir, name, headers[name], split.archive)
-        if archived:
-            archive_manifest["archived_files"].append(str(archived))
-
     manifest_path = archive_dir / "manifest.json"
     manifest_path.parent.mkdir(parents=True, exist_ok=True)
     manifest_path.write_text(json.dumps(archive_manifest, indent=2) + "\n", encoding="utf-8")
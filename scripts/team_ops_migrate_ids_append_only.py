@@ -13,6 +13,7 @@ from __future__ import annotations
 
 import csv
 import re
+from collections import Counter
 from pathlib import Path
 
 ROOT = Path("/Users/e/Documents/GUNS/ENIDSASSETS/NaturesDietMarketingTeam")
@@ -40,51 +41,46 @@ def main() -> None:
         print("No rows found.")
         return
 
-    by_id = {}
+    # One pass records the latest row and row count per request_id; insertion
+    # order keeps request_ids in first-appended order.
+    latest: dict[str, dict] = {}
+    counts: Counter[str] = Counter()
     for row in rows:
         rid = (row.get("request_id") or "").strip()
         if rid:
-            by_id.setdefault(rid, []).append(row)
+            latest[rid] = row
+            counts[rid] += 1
 
     append_rows = []
-
-    # 1) Canonicalize legacy IDs via append-only superseding row.
-    for rid, group in sorted(by_id.items()):
+    for rid, row in latest.items():
+        # 1) Canonicalize legacy IDs via append-only superseding row.
         canonical = normalize_request_id(rid)
-        if canonical == rid:
-            continue
-        latest = group[-1]
-        new_row = dict(latest)
-        new_row["request_id"] = canonical
-        new_row["statement"] = (
-            "Append-only migration row: canonicalized legacy request_id format to CR-<TEAM>-NNNN."
-        )
-        new_row["supersedes_request_id"] = rid
-        append_rows.append(new_row)
-
-    # 2) Backfill unresolved duplicate supersedes pointers.
-    for rid, group in sorted(by_id.items()):
-        if len(group) <= 1:
-            continue
-        latest = group[-1]
-        sup = (latest.get("supersedes_request_id") or "").strip()
-        if sup == rid:
-            continue
-        new_row = dict(latest)
-        new_row["statement"] = (
-            "Append-only migration row: backfilled supersedes_request_id for duplicate request_id lineage."
-        )
-        new_row["supersedes_request_id"] = rid
-        append_rows.append(new_row)
+        if canonical != rid:
+            new_row = dict(row)
+            new_row["request_id"] = canonical
+            new_row["statement"] = (
+                "Append-only migration row: canonicalized legacy request_id format to CR-<TEAM>-NNNN."
+            )
+            new_row["supersedes_request_id"] = rid
+            append_rows.append(new_row)
+
+        # 2) Backfill unresolved duplicate supersedes pointers.
+        if counts[rid] > 1 and (row.get("supersedes_request_id") or "").strip() != rid:
+            new_row = dict(row)
+            new_row["statement"] = (
+                "Append-only migration row: backfilled supersedes_request_id for duplicate request_id lineage."
+            )
+            new_row["supersedes_request_id"] = rid
+            append_rows.append(new_row)
 
     if not append_rows:
         print("No migration rows required.")
         return
 
+    # Group-commit: one open and one writerows call for the whole batch.
     with QUEUE.open("a", encoding="utf-8", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
-        for row in append_rows:
-            writer.writerow(row)
+        writer.writerows(append_rows)
 
     print(f"Appended {len(append_rows)} migration row(s) to {QUEUE}")
 
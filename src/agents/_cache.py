@@ -0,0 +1,25 @@
+import os
+from typing import Optional
+from langchain_core.globals import get_llm_cache, set_llm_cache
+from src.config import PROJECT_ROOT
+
+# Local response cache shared by every agent in the process, enabled with LLM_CACHE=1. Identical
+# prompt + model params are served from SQLite instead of another Gemini round-trip, which keeps
+# iterative development runs (the agents' __main__ blocks) fast and cheap. It is off by default
+# because most agents sample at temperature > 0 and a cached reply would pin one sample forever.
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE") == "1"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(PROJECT_ROOT, ".llm_cache.db"))
+
+if LLM_CACHE_ENABLED and get_llm_cache() is None:
+    from langchain_community.cache import SQLiteCache
+
+    set_llm_cache(SQLiteCache(database_path=LLM_CACHE_PATH))
+
+def cache_for(temperature: float, opt_in: bool = False) -> Optional[bool]:
+    """
+    Returns the `cache` setting for a chat model. Sampled models (temperature > 0) bypass the
+    cache unless the caller opts in, since replaying one sample would hide the variation they rely on.
+    """
+    if temperature > 0 and not opt_in:
+        return False
+    return None
@@ -0,0 +1,33 @@
+import hashlib
+from typing import Callable, Dict, List, Set, Tuple, TypeVar
+from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+def pair_key(campaign_goal: str, research_context: str) -> str:
+    """
+    Stable (cross-process) key for a (campaign_goal, research_context) pair.
+    """
+    payload = f"{campaign_goal}\x1f{research_context}".encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+def run_unique(pairs: List[Tuple[str, str]], run: Callable[[List[Tuple[str, str]]], List[ModelT]]) -> List[ModelT]:
+    """
+    Calls run once with the distinct pairs and fans the results back out in input order.
+    Repeated pairs get their own copy so callers can modify results independently.
+    """
+    unique: Dict[str, Tuple[str, str]] = {}
+    keys = []
+    for pair in pairs:
+        key = pair_key(*pair)
+        keys.append(key)
+        unique.setdefault(key, pair)
+
+    results = dict(zip(unique, run(list(unique.values()))))
+    fanned_out: List[ModelT] = []
+    seen: Set[str] = set()
+    for key in keys:
+        result = results[key]
+        fanned_out.append(result.model_copy(deep=True) if key in seen else result)
+        seen.add(key)
+    return fanned_out
@@ -0,0 +1,107 @@
+import re
+from functools import lru_cache, partial
+from typing import Any, Optional, Type, TypeVar
+from langchain_core.runnables import Runnable, RunnableLambda
+from langchain_google_genai import ChatGoogleGenerativeAI
+from pydantic import BaseModel
+import src.agents._cache  # noqa: F401  (installs the shared LLM cache)
+from src.bootstrap import ensure_env
+from src.config import LLM_MAX_ATTEMPTS, LLM_REQUEST_TIMEOUT_SECONDS
+from src.utils.logger import log_agent_event
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*```\s*$", re.DOTALL)
+
+# Model used when a call to the requested model fails or times out.
+FALLBACK_MODEL = "gemini-2.5-flash"
+
+# The OpenAPI subset Gemini accepts as a response_schema. Everything else pydantic emits (title,
+# default, maxLength, $defs, ...) is dropped, and only these string formats are kept.
+_GEMINI_SCHEMA_KEYS = frozenset({"type", "format", "description", "nullable", "enum", "properties", "required", "items", "minItems", "maxItems"})
+_GEMINI_SCHEMA_FORMATS = frozenset({"enum", "date-time"})
+
+def _gemini_schema(node: Any, defs: dict) -> Any:
+    # Inlines $ref, turns Optional's anyOf [X, null] into X with nullable, and strips unsupported keys.
+    if not isinstance(node, dict):
+        return node
+    if "$ref" in node:
+        target = defs[node["$ref"].rsplit("/", 1)[-1]]
+        return _gemini_schema({**target, **{k: v for k, v in node.items() if k != "$ref"}}, defs)
+    variants = node.get("anyOf")
+    if variants:
+        non_null = [variant for variant in variants if variant.get("type") != "null"]
+        if len(non_null) == 1:
+            schema = _gemini_schema({**non_null[0], **{k: v for k, v in node.items() if k != "anyOf"}}, defs)
+            if len(non_null) < len(variants):
+                schema["nullable"] = True
+            return schema
+    schema = {}
+    for key, value in node.items():
+        if key not in _GEMINI_SCHEMA_KEYS or (key == "format" and value not in _GEMINI_SCHEMA_FORMATS):
+            continue
+        if key == "properties":
+            value = {name: _gemini_schema(prop, defs) for name, prop in value.items()}
+        elif key == "items":
+            value = _gemini_schema(value, defs)
+        schema[key] = value
+    return schema
+
+def _response_schema(response_model: Type[BaseModel]) -> dict:
+    """
+    Returns response_model's JSON schema flattened into a form Gemini's response_schema accepts.
+    """
+    schema = response_model.model_json_schema()
+    return _gemini_schema(schema, schema.get("$defs", {}))
+
+@lru_cache(maxsize=16)
+def _chat_model(model: str, temperature: float, cache: Optional[bool], response_model: Optional[Type[BaseModel]]) -> ChatGoogleGenerativeAI:
+    # Client-side retries are capped; retry policy lives on the agent chains (see with_retries).
+    settings: dict = {"model": model, "temperature": temperature, "cache": cache, "timeout": LLM_REQUEST_TIMEOUT_SECONDS, "max_retries": 1}
+    if response_model is not None:
+        settings["response_mime_type"] = "application/json"
+        settings["response_schema"] = _response_schema(response_model)
+    return ChatGoogleGenerativeAI(**settings)
+
+def _log_fallback(model: str, prompt: Any) -> Any:
+    log_agent_event("LLMFallback", "model_fallback", {"model": model, "fallback_model": FALLBACK_MODEL})
+    return prompt
+
+@lru_cache(maxsize=8)
+def get_llm(model: str, temperature: float, cache: Optional[bool] = None, response_model: Optional[Type[BaseModel]] = None) -> Runnable:
+    """
+    Returns the shared chat model for (model, temperature, cache, response_model). Clients are created
+    on first use and reused by every agent that asks for the same settings.
+    With response_model, Gemini is put in JSON mode and constrained to that model's JSON schema.
+    JSON-mode models never use the response cache: a reply that fails validation would be cached
+    before the parser sees it, and every retry in with_retries would replay it.
+    Every request has a hard timeout; failures fail over to FALLBACK_MODEL and are logged.
+    """
+    ensure_env()
+    if response_model is not None:
+        cache = False
+    primary = _chat_model(model, temperature, cache, response_model)
+    if model == FALLBACK_MODEL:
+        return primary
+    fallback = RunnableLambda(partial(_log_fallback, model)) | _chat_model(FALLBACK_MODEL, temperature, cache, response_model)
+    return primary.with_fallbacks([fallback])
+
+def with_retries(chain: Runnable) -> Runnable:
+    """
+    Retries the whole chain (model call and output parsing) with jittered exponential backoff.
+    """
+    return chain.with_retry(stop_after_attempt=LLM_MAX_ATTEMPTS, wait_exponential_jitter=True)
+
+def _message_json(message: Any) -> str:
+    content = message.content
+    if not isinstance(content, str):
+        content = "".join(part if isinstance(part, str) else part.get("text", "") for part in content)
+    match = _FENCE_RE.match(content)
+    return match.group(1) if match else content
+
+def json_model_parser(response_model: Type[ModelT]) -> Runnable:
+    """
+    Chain tail that decodes and validates a JSON reply straight into response_model in one pass
+    (pydantic-core's model_validate_json), tolerating a surrounding ```json fence.
+    """
+    return RunnableLambda(lambda message: response_model.model_validate_json(_message_json(message)))
@@ -1,16 +1,19 @@
-import os
-from dotenv import load_dotenv
+import re
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_google_genai import ChatGoogleGenerativeAI
-from typing import List
+from src.bootstrap import ensure_env
+from src.agents._llm import get_llm, with_retries
+from src.agents.gencache import ListResponseCache, template_id
+from typing import List, Optional, Tuple
+from src.config import LLM_BATCH_MAX_CONCURRENCY
 
-load_dotenv()
+ensure_env()
 
-if not os.getenv("GOOGLE_API_KEY"):
-    raise ValueError("GOOGLE_API_KEY environment variable not set.")
+# One numbered-list item per line: "1. Objective" or "1) Objective", surrounding whitespace dropped.
+_ITEM_RE = re.compile(r'^\s*\d+[.)][ \t]*(.+?)\s*$', re.MULTILINE)
 
-llm = ChatGoogleGenerativeAI(model="gemini-pro-latest", temperature=0.7)
+# Plans for the same goal/audience are reused across requested post counts.
+_plan_cache = ListResponseCache()
 
 class ContentPlannerAgent:
     def __init__(self):
@@ -33,20 +36,57 @@ class ContentPlannerAgent:
             """,
             )
         ])
-        self.chain = self.prompt | llm | StrOutputParser()
+        self.chain = with_retries(self.prompt | get_llm("gemini-pro-latest", 0.7) | StrOutputParser())
+        self.template_id = template_id(self.prompt)
 
     def plan_posts(self, campaign_goal: str, target_audience: str, num_posts: int) -> List[str]:
         """
         Generates a list of social media post objectives/themes.
         """
-        response = self.chain.invoke({
+        slots = (campaign_goal, target_audience)
+        cached = _plan_cache.get(self.template_id, slots, num_posts)
+        if cached is not None:
+            return cached
+        response = self.chain.invoke(self._inputs(campaign_goal, target_audience, num_posts))
+        objectives = self._parse_objectives(response)
+        _plan_cache.put(self.template_id, slots, objectives)
+        return objectives
+
+    def plan_posts_batch(self, requests: List[Tuple[str, str, int]]) -> List[List[str]]:
+        """
+        Plans several campaigns at once. Each request is a (campaign_goal, target_audience, num_posts)
+        tuple. Requests answered by the plan cache skip the LLM; the rest fan out concurrently and
+        fill the cache. Results come back in request order.
+        """
+        plans: List[Optional[List[str]]] = [
+            _plan_cache.get(self.template_id, (campaign_goal, target_audience), num_posts)
+            for campaign_goal, target_audience, num_posts in requests
+        ]
+        misses = [i for i, plan in enumerate(plans) if plan is None]
+        if misses:
+            responses = self.chain.batch(
+                [self._inputs(*requests[i]) for i in misses],
+                config={"max_concurrency": LLM_BATCH_MAX_CONCURRENCY},
+            )
+            for i, response in zip(misses, responses):
+                campaign_goal, target_audience, _ = requests[i]
+                objectives = self._parse_objectives(response)
+                _plan_cache.put(self.template_id, (campaign_goal, target_audience), objectives)
+                plans[i] = objectives
+        return [plan for plan in plans if plan is not None]
+
+    @staticmethod
+    def _inputs(campaign_goal: str, target_audience: str, num_posts: int) -> dict:
+        return {
             "campaign_goal": campaign_goal,
             "target_audience": target_audience,
             "num_posts": num_posts
-        })
+        }
+
+    @staticmethod
+    def _parse_objectives(response: str) -> List[str]:
         # Parse the numbered list into a Python list of strings
-        objectives = [line.split('.', 1)[1].strip() for line in response.split('\n') if line.strip() and line.strip()[0].isdigit()]
-        return objectives
+        return _ITEM_RE.findall(response)
 
 if __name__ == "__main__":
     planner = ContentPlannerAgent()
@@ -1,22 +1,25 @@
+import logging
 import os
-from dotenv import load_dotenv
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser
-from langchain_google_genai import ChatGoogleGenerativeAI
-from src.config import COMPANY_NAME, FLAGSHIP_PRODUCT
-from typing import Optional, List
-from src.data_models.social_media import SocialMediaPost, InstagramPost, FacebookPost, SocialMediaPostDraft
+from src.bootstrap import ensure_env
+from src.agents._dedupe import run_unique
+from src.agents._llm import get_llm, json_model_parser, with_retries
+from src.config import COMPANY_NAME, FLAGSHIP_PRODUCT, LLM_BATCH_MAX_CONCURRENCY
+from typing import Optional, List, Tuple
+from src.data_models.social_media import SocialMediaPost, InstagramPost, FacebookPost, SocialMediaPostDraft, SocialMediaPostDraftList
 
-load_dotenv()
+ensure_env()
 
-if not os.getenv("GOOGLE_API_KEY"):
-    raise ValueError("GOOGLE_API_KEY environment variable not set.")
+logger = logging.getLogger(__name__)
 
-llm = ChatGoogleGenerativeAI(model="gemini-pro-latest", temperature=0.7)
+# Built once per process; graph nodes construct a fresh agent on every call.
+_DRAFT_PARSER = json_model_parser(SocialMediaPostDraft)
+_DRAFT_LIST_PARSER = json_model_parser(SocialMediaPostDraftList)
 
 class CopywriterAgent:
     def __init__(self):
-        self.parser = PydanticOutputParser(pydantic_object=SocialMediaPostDraft)
+        # Gemini's JSON mode enforces the schema server-side; the parser only validates into the model.
+        self.parser = _DRAFT_PARSER
         system_template = """You are an expert Marketing Copywriter for {company_name}. Your task is to draft compelling marketing content for a social media post based on the provided campaign goal and research context.
 
             **CRITICAL INSTRUCTIONS:**
@@ -36,28 +39,80 @@ class CopywriterAgent:
             }}
             ```
             **Note:** You are only responsible for `platform`, `text_content`, `hashtags`, `mentions`, `call_to_action_text`, and `call_to_action_url`. Do NOT include `image_paths` or `video_path` as these will be handled by the Creative Director.
-
-            {format_instructions}
             """
+        # Keep the static system message first and the per-call fields in the trailing user
+        # message: Gemini's implicit prefix caching only reuses an unchanged leading prefix.
         self.prompt = ChatPromptTemplate.from_messages([
             ("system", system_template),
             ("user", "Campaign Goal: {campaign_goal}\nResearch Context: {research_context}\n\nDraft marketing content for a social media post:")
-        ])
-        self.chain = self.prompt | llm | self.parser
+        ]).partial(company_name=COMPANY_NAME, flagship_product=FLAGSHIP_PRODUCT)
+        self.chain = with_retries(self.prompt | get_llm("gemini-pro-latest", 0.7, response_model=SocialMediaPostDraft) | self.parser)
+
+        # Marshaled path: several goals sharing one research context go out in a single request,
+        # amortizing the system prompt across all of them.
+        self.list_parser = _DRAFT_LIST_PARSER
+        self.marshaled_prompt = ChatPromptTemplate.from_messages([
+            ("system", system_template),
+            ("user", "Research Context: {research_context}\n\nCampaign Goals:\n{campaign_goals}\n\nDraft one social media post per campaign goal. Produce exactly {k} drafts as a JSON list, in the same order as the goals:")
+        ]).partial(company_name=COMPANY_NAME, flagship_product=FLAGSHIP_PRODUCT)
+        self.marshaled_chain = with_retries(self.marshaled_prompt | get_llm("gemini-pro-latest", 0.7, response_model=SocialMediaPostDraftList) | self.list_parser)
 
     def draft_content(self, campaign_goal: str, research_context: str) -> SocialMediaPostDraft:
         """
         Drafts marketing content based on the campaign goal and research context, returning a SocialMediaPostDraft object.
         """
-        return self.chain.invoke({
+        return self.chain.invoke(self._inputs(campaign_goal, research_context))
+
+    async def adraft_content(self, campaign_goal: str, research_context: str) -> SocialMediaPostDraft:
+        """
+        Async variant of draft_content, for running alongside other agents with asyncio.gather.
+        """
+        return await self.chain.ainvoke(self._inputs(campaign_goal, research_context))
+
+    def draft_content_batch(self, inputs: List[Tuple[str, str]]) -> List[SocialMediaPostDraft]:
+        """
+        Drafts content for several (campaign_goal, research_context) pairs at once. Repeated pairs are
+        drafted once; the LLM calls fan out concurrently and the drafts come back in input order.
+        """
+        return run_unique(inputs, lambda unique_inputs: self.chain.batch(
+            [self._inputs(campaign_goal, research_context) for campaign_goal, research_context in unique_inputs],
+            config={"max_concurrency": LLM_BATCH_MAX_CONCURRENCY},
+        ))
+
+    def draft_content_marshaled(self, goals: List[str], research_context: str, k: int = 4) -> List[SocialMediaPostDraft]:
+        """
+        Drafts one post per goal, packing up to k goals into each LLM request. All goals must share
+        research_context. Chunks are sent concurrently; a chunk whose reply does not hold exactly one
+        draft per goal is redrafted one goal at a time.
+        """
+        chunks = [goals[i:i + k] for i in range(0, len(goals), k)]
+        responses = self.marshaled_chain.batch(
+            [{
+                "research_context": research_context,
+                "campaign_goals": "\n".join(f"{n}. {goal}" for n, goal in enumerate(chunk, 1)),
+                "k": len(chunk)
+            } for chunk in chunks],
+            config={"max_concurrency": LLM_BATCH_MAX_CONCURRENCY},
+        )
+        drafts: List[SocialMediaPostDraft] = []
+        for chunk, response in zip(chunks, responses):
+            if len(response.root) == len(chunk):
+                drafts.extend(response.root)
+            else:
+                drafts.extend(self.draft_content_batch([(goal, research_context) for goal in chunk]))
+        return drafts
+
+    @staticmethod
+    def _inputs(campaign_goal: str, research_context: str) -> dict:
+        # Company and product names are bound on the prompt via .partial in __init__.
+        return {
             "campaign_goal": campaign_goal,
-            "research_context": research_context,
-            "format_instructions": self.parser.get_format_instructions(),
-            "company_name": COMPANY_NAME,
-            "flagship_product": FLAGSHIP_PRODUCT
-        })
+            "research_context": research_context
+        }
 
 if __name__ == "__main__":
+    # Drafts are only rendered at DEBUG (LOG_LEVEL=DEBUG); nothing is serialized otherwise.
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
     copywriter = CopywriterAgent()
     
     sample_campaign_goal = "Promote the new organic cat food 'Whiskers & Wellness Organic Salmon Feast' focusing on its health benefits for Instagram."
@@ -73,8 +128,8 @@ if __name__ == "__main__":
     print("\n--- Drafting Instagram Post Content ---")
     try:
         insta_post_draft = copywriter.draft_content(sample_campaign_goal, sample_research_context)
-        print("Generated SocialMediaPostDraft:")
-        print(insta_post_draft.json(indent=2))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Generated SocialMediaPostDraft: %s", insta_post_draft)
     except Exception as e:
         print(f"Error drafting content: {e}")
 
@@ -87,7 +142,7 @@ if __name__ == "__main__":
     print("\n--- Drafting Facebook Post Content ---")
     try:
         fb_post_draft = copywriter.draft_content(sample_campaign_goal_fb, sample_research_context_fb)
-        print("Generated SocialMediaPostDraft:")
-        print(fb_post_draft.json(indent=2))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Generated SocialMediaPostDraft: %s", fb_post_draft)
     except Exception as e:
         print(f"Error drafting content: {e}")
@@ -1,23 +1,33 @@
+import logging
 import os
-from typing import Optional
-from dotenv import load_dotenv
+import re
+from typing import Dict, List, Optional, Tuple
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser
-from langchain_google_genai import ChatGoogleGenerativeAI
-from src.config import COMPANY_NAME, FLAGSHIP_PRODUCT
+from src.bootstrap import ensure_env
+from src.agents._dedupe import run_unique
+from src.agents._llm import get_llm, json_model_parser, with_retries
+from src.config import COMPANY_NAME, FLAGSHIP_PRODUCT, LLM_BATCH_MAX_CONCURRENCY, LLM_LONG_BATCH_MAX_CONCURRENCY
 from src.data_models.design_spec import DesignSpecification
 
-load_dotenv()
+ensure_env()
 
-if not os.getenv("GOOGLE_API_KEY"):
-    raise ValueError("GOOGLE_API_KEY environment variable not set.")
+logger = logging.getLogger(__name__)
 
-llm = ChatGoogleGenerativeAI(model="gemini-pro-latest", temperature=0.7)
+# Goals that usually yield video specs (script, style, assets) and so generate far longer output.
+_LONG_FORM_RE = re.compile(r"\b(?:video|story|stories|reels?)\b", re.IGNORECASE)
+
+def is_long_form(campaign_goal: str) -> bool:
+    """
+    Cheap predictor for whether a goal will produce a long (video) design spec.
+    """
+    return _LONG_FORM_RE.search(campaign_goal) is not None
+
+# Built once per process; graph nodes construct a fresh agent on every call.
+_DESIGN_SPEC_PARSER = json_model_parser(DesignSpecification)
 
 class CreativeDirectorAgent:
     def __init__(self):
-        self.parser = PydanticOutputParser(pydantic_object=DesignSpecification)
-        format_instructions = self.parser.get_format_instructions() # Define it here
+        self.parser = _DESIGN_SPEC_PARSER
         system_template = """You are an expert Creative Director for {company_name}. Your task is to provide detailed 'Design Specs' based on the provided campaign goal and research context. These specs must guide a human designer or an AI image generator, focusing on visual elements, tone, and overall composition.
 
             **CRITICAL INSTRUCTIONS:**
@@ -41,30 +51,69 @@ class CreativeDirectorAgent:
                 "proposed_design_change": "A proposal for improving the design system, if applicable."
             }}
             ```
-            {format_instructions}
             """
+        # Static instructions stay in the system message ahead of the per-call user message so the
+        # shared prefix stays byte-identical across calls and eligible for Gemini's prefix cache.
         self.prompt = ChatPromptTemplate.from_messages([
             ("system", system_template),
             ("user", "Campaign Goal: {campaign_goal}\nResearch Context: {research_context}\n\nProvide Design Specifications:")
-        ])
-        self.chain = self.prompt | llm | self.parser
+        ]).partial(company_name=COMPANY_NAME, flagship_product=FLAGSHIP_PRODUCT)
+        # Gemini's JSON mode enforces the schema server-side; the parser only validates into the model.
+        self.chain = with_retries(self.prompt | get_llm("gemini-pro-latest", 0.7, response_model=DesignSpecification) | self.parser)
 
     def generate_design_specs(self, campaign_goal: str, research_context: str, reference_image_path: Optional[str] = None) -> DesignSpecification:
         """
         Generates design specifications based on the campaign goal and research context,
         optionally considering a reference image, returning a DesignSpecification object.
         """
-        return self.chain.invoke({
+        return self.chain.invoke(self._inputs(campaign_goal, research_context))
+
+    async def agenerate_design_specs(self, campaign_goal: str, research_context: str, reference_image_path: Optional[str] = None) -> DesignSpecification:
+        """
+        Async variant of generate_design_specs, for running alongside other agents with asyncio.gather.
+        """
+        return await self.chain.ainvoke(self._inputs(campaign_goal, research_context))
+
+    def generate_design_specs_batch(self, inputs: List[Tuple[str, str]], max_concurrency: int = LLM_BATCH_MAX_CONCURRENCY) -> List[DesignSpecification]:
+        """
+        Generates design specifications for several (campaign_goal, research_context) pairs at once.
+        Repeated pairs are generated once; the LLM calls fan out concurrently and the specs come back
+        in input order.
+        """
+        return run_unique(inputs, lambda unique_inputs: self.chain.batch(
+            [self._inputs(campaign_goal, research_context) for campaign_goal, research_context in unique_inputs],
+            config={"max_concurrency": max_concurrency},
+        ))
+
+    def generate_design_specs_binned(self, inputs: List[Tuple[str, str]]) -> List[DesignSpecification]:
+        """
+        Like generate_design_specs_batch, but batches long-form (video) and short-form goals separately
+        so short specs don't sit waiting on a few long generations. Results come back in input order.
+        """
+        long_indices = [i for i, (campaign_goal, _) in enumerate(inputs) if is_long_form(campaign_goal)]
+        long_set = set(long_indices)
+        short_indices = [i for i in range(len(inputs)) if i not in long_set]
+
+        specs: Dict[int, DesignSpecification] = {}
+        for indices, max_concurrency in ((long_indices, LLM_LONG_BATCH_MAX_CONCURRENCY), (short_indices, LLM_BATCH_MAX_CONCURRENCY)):
+            if indices:
+                results = self.generate_design_specs_batch([inputs[i] for i in indices], max_concurrency=max_concurrency)
+                specs.update(zip(indices, results))
+        return [specs[i] for i in range(len(inputs))]
+
+    @staticmethod
+    def _inputs(campaign_goal: str, research_context: str) -> dict:
+        # Company and product names are bound on the prompt via .partial in __init__.
+        return {
             "campaign_goal": campaign_goal,
-            "research_context": research_context,
-            "format_instructions": self.parser.get_format_instructions(),
-            "company_name": COMPANY_NAME,
-            "flagship_product": FLAGSHIP_PRODUCT
-        })
+            "research_context": research_context
+        }
 
 if __name__ == "__main__":
     # Example usage (for testing)
     # Ensure GOOGLE_API_KEY is set in your environment.
+    # Specs are only rendered at DEBUG (LOG_LEVEL=DEBUG); nothing is serialized otherwise.
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
     creative_director = CreativeDirectorAgent()
     
     sample_campaign_goal = "Promote the new organic cat food 'Whiskers & Wellness Organic Salmon Feast' focusing on its health benefits in an email campaign."
@@ -84,7 +133,7 @@ if __name__ == "__main__":
     print("\n--- Generating Design Specs for Email Campaign ---")
     try:
         design_specs_obj = creative_director.generate_design_specs(sample_campaign_goal, sample_research_context)
-        print("Generated DesignSpecification:")
-        print(design_specs_obj.json(indent=2))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Generated DesignSpecification: %s", design_specs_obj)
     except Exception as e:
         print(f"Error generating design specs: {e}")
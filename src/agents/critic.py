@@ -1,20 +1,41 @@
 import os
-from dotenv import load_dotenv
+import re
+from typing import Iterator
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_google_genai import ChatGoogleGenerativeAI
+from src.bootstrap import ensure_env
+from src.agents._cache import cache_for
+from src.agents._llm import get_llm, with_retries
 from src.config import COMPANY_NAME, FLAGSHIP_PRODUCT
 
-load_dotenv()
+ensure_env()
 
-# Ensure GOOGLE_API_KEY is set as an environment variable
-if not os.getenv("GOOGLE_API_KEY"):
-    raise ValueError("GOOGLE_API_KEY environment variable not set.")
+CRITIC_TEMPERATURE = 0.5
+# Sentinel the critic emits when a draft needs no further revision.
+NO_FURTHER_IMPROVEMENTS = "No further improvements needed."
+# Routine critiques run on the faster flash tier; the pro model is kept for high-stakes critiques
+# (e.g. legal or health claims). Both are overridable via environment variables.
+CRITIC_MODEL = os.getenv("CRITIC_MODEL", "gemini-2.5-flash")
+CRITIC_PRO_MODEL = os.getenv("CRITIC_PRO_MODEL", "gemini-2.5-pro")
+# Critiques are sampled, so even with LLM_CACHE=1 they skip the shared cache unless CRITIC_LLM_CACHE=1 is set.
+_critic_cache = cache_for(CRITIC_TEMPERATURE, opt_in=os.getenv("CRITIC_LLM_CACHE") == "1")
 
-llm = ChatGoogleGenerativeAI(model="gemini-2.5-pro", temperature=0.5)
+# Goals touching legal, regulatory or medical claims, where a missed problem costs more than the pro model.
+_HIGH_STAKES_RE = re.compile(
+    r"\b(?:legal|compliance|regulat\w*|medical|veterinar\w*|disease|cures?|clinical\w*|FDA|AAFCO|warrant(?:y|ies))\b",
+    re.IGNORECASE,
+)
+
+def is_high_stakes(campaign_goal: str) -> bool:
+    """
+    Cheap predictor for whether a goal makes legal or health claims that warrant the pro critic.
+    """
+    return _HIGH_STAKES_RE.search(campaign_goal) is not None
 
 class CriticAgent:
     def __init__(self):
+        # The system message is fully static; campaign-specific input belongs only in the user
+        # message so repeated critiques share a cacheable prefix.
         self.prompt = ChatPromptTemplate.from_messages([
             ("system", f"""You are an expert Marketing Critic for {COMPANY_NAME}. Your role is to provide constructive feedback on generated marketing content and design specifications. Your goal is to ensure the output is:
             1.  **Aligned with Campaign Goal:** Does it effectively meet the campaign's objective, including specific constraints (e.g., word count)?
@@ -23,22 +44,47 @@ class CriticAgent:
             4.  **Specific and Actionable:** Provide concrete suggestions for improvement. Always suggest revisions to *both* marketing content and design specs if necessary, even if one seems fine.
             5.  **Concise Output:** Your output MUST contain ONLY the constructive feedback. Do NOT include any conversational filler, introductory/concluding remarks, or explanations of your role. Just the feedback.
 
-            **IMPORTANT:** Your feedback should be actionable and focused on iterative improvement. If the content is perfect and all constraints are met, state "No further improvements needed." Otherwise, always suggest revisions.
+            **IMPORTANT:** Your feedback should be actionable and focused on iterative improvement. If the content is perfect and all constraints are met, state "{NO_FURTHER_IMPROVEMENTS}" Otherwise, always suggest revisions.
             """),
             ("user", "Campaign Goal: {campaign_goal}\nResearch Context: {research_context}\nMarketing Content: {marketing_content}\nDesign Specs: {design_specs}\n\nProvide constructive feedback for improvement, specifically noting if constraints from the Campaign Goal (e.g., word count) have been met:")
         ])
-        self.chain = self.prompt | llm | StrOutputParser()
+        self.chain = with_retries(self.prompt | get_llm(CRITIC_MODEL, CRITIC_TEMPERATURE, _critic_cache) | StrOutputParser())
+        self.pro_chain = with_retries(self.prompt | get_llm(CRITIC_PRO_MODEL, CRITIC_TEMPERATURE, _critic_cache) | StrOutputParser())
 
-    def critique(self, campaign_goal: str, research_context: str, marketing_content: str, design_specs: str) -> str:
+    def critique(self, campaign_goal: str, research_context: str, marketing_content: str, design_specs: str, high_stakes: bool = False) -> str:
         """
         Provides critique on the generated marketing content and design specifications.
+        Set high_stakes for content that needs the pro model (e.g. legal copy or final-pass review).
         """
-        return self.chain.invoke({
+        chain = self.pro_chain if high_stakes else self.chain
+        return chain.invoke(self._inputs(campaign_goal, research_context, marketing_content, design_specs))
+
+    def critique_stream(self, campaign_goal: str, research_context: str, marketing_content: str, design_specs: str, high_stakes: bool = False) -> Iterator[str]:
+        """
+        Streams the critique as it is generated. Closing the iterator early stops the generation.
+        with_retries does not cover .stream(), so a failure before the first chunk falls back to the
+        retried invoke (yielding the whole critique at once); a failure mid-stream is raised.
+        """
+        chain = self.pro_chain if high_stakes else self.chain
+        inputs = self._inputs(campaign_goal, research_context, marketing_content, design_specs)
+        started = False
+        try:
+            for chunk in chain.stream(inputs):
+                started = True
+                yield chunk
+        except Exception:
+            if started:
+                raise
+            yield chain.invoke(inputs)
+
+    @staticmethod
+    def _inputs(campaign_goal: str, research_context: str, marketing_content: str, design_specs: str) -> dict:
+        return {
             "campaign_goal": campaign_goal,
             "research_context": research_context,
             "marketing_content": marketing_content,
             "design_specs": design_specs
-        })
+        }
 
 if __name__ == "__main__":
     # Example usage
@@ -1,20 +1,30 @@
 import os
-from dotenv import load_dotenv
+from functools import lru_cache
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_google_genai import ChatGoogleGenerativeAI
+from src.bootstrap import ensure_env
+from src.agents._llm import get_llm, with_retries
 
-from src.tools.screenshot_tool import take_screenshot
-from src.tools.css_analyzer import get_all_css
+from src.tools._snapshot_cache import cached_css, cached_screenshot
+from src.tools.css_filter import filter_css
 from src.config import PROJECT_ROOT, SCREENSHOTS_DIR, DATA_PATH
 
-load_dotenv()
+ensure_env()
 
-# Ensure GOOGLE_API_KEY is set as an environment variable
-if not os.getenv("GOOGLE_API_KEY"):
-    raise ValueError("GOOGLE_API_KEY environment variable not set.")
+# Filling the design-system template doesn't need the pro tier; override via DESIGN_ANALYST_MODEL.
+DESIGN_ANALYST_MODEL = os.getenv("DESIGN_ANALYST_MODEL", "gemini-2.5-flash")
 
-llm = ChatGoogleGenerativeAI(model="gemini-2.5-pro", temperature=0.2)
+@lru_cache(maxsize=4)
+def _load_template(template_path: str, mtime_ns: int) -> str:
+    # mtime_ns is part of the cache key so an edited template is re-read.
+    with open(template_path, 'r') as f:
+        return f.read()
+
+def read_template(template_path: str) -> str:
+    """
+    Returns the contents of a design system template, read from disk only when it has changed.
+    """
+    return _load_template(template_path, os.stat(template_path).st_mtime_ns)
 
 class DesignAnalystAgent:
     def __init__(self):
@@ -35,7 +45,7 @@ class DesignAnalystAgent:
             """),
             ("user", "Design System Template:\n{template}\n\nWebsite URL: {url}\nScreenshot Description: {screenshot_description}\nExtracted CSS:\n{css_content}\n\nFill out the Design System Template based on the above information:")
         ])
-        self.chain = self.prompt | llm | StrOutputParser()
+        self.chain = with_retries(self.prompt | get_llm(DESIGN_ANALYST_MODEL, 0.2) | StrOutputParser())
 
     def analyze_design(self, url: str, template_path: str) -> str:
         """
@@ -44,17 +54,16 @@ class DesignAnalystAgent:
         # Ensure the screenshots directory exists
         os.makedirs(SCREENSHOTS_DIR, exist_ok=True)
         screenshot_filename = os.path.join(SCREENSHOTS_DIR, f"{url.replace('https://', '').replace('/', '_')}.png")
-        take_screenshot(url, screenshot_filename)
+        cached_screenshot(url, screenshot_filename)
         # Note: We are not passing the actual image to the LLM directly, but will describe it.
         # This is a simplification for now. Advanced multi-modal would involve sending the image.
         screenshot_description = f"Screenshot of {url} saved to {screenshot_filename}"
 
-        # Get all CSS
-        css_content = get_all_css(url)
+        # Get all CSS (reused from the snapshot cache when recent), trimmed to the properties the template needs
+        css_content = filter_css(cached_css(url))
 
-        # Read the design system template
-        with open(template_path, 'r') as f:
-            design_template = f.read()
+        # Read the design system template (cached across calls)
+        design_template = read_template(template_path)
 
         # Call LLM to fill the template
         filled_design_system = self.chain.invoke({
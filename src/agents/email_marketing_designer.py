@@ -1,11 +1,43 @@
 import os
 import re
-from google import genai
+from functools import lru_cache
 from dotenv import load_dotenv
 from typing import Optional
+from src.utils.campaign_paths import campaign_paths
+from src.utils.clients import get_genai_client
+from src.utils.llm_cache import CachedGeminiClient
 
 load_dotenv()
 
+# Leading ```html (or bare ```) fence and trailing ``` fence around an LLM reply.
+_FENCE_RE = re.compile(r'^\s*```(?:html)?\s*|\s*```\s*$', re.DOTALL)
+# Everything after "Image saved to:" up to the last non-space character (paths may contain spaces).
+_IMAGE_SAVED_RE = re.compile(r'Image saved to:\s*(.*\S)', re.DOTALL)
+
+# Kept free of interpolation so the system prefix is byte-identical across calls and eligible for
+# Gemini's implicit prefix caching.
+EMAIL_DESIGNER_SYSTEM_INSTRUCTION = """
+        You are an expert Email Marketing Designer. Your task is to generate a single, complete,
+        email-friendly HTML file based on the provided campaign content, design specifications,
+        and image path.
+
+        **CRITICAL INSTRUCTIONS for HTML Generation:**
+        1.  **Email Compatibility:** All CSS MUST be inlined. Use a table-based layout or modern, email-compatible CSS. Ensure cross-client compatibility.
+        2.  **Responsiveness:** Implement basic responsiveness (e.g., fluid images, max-width on containers).
+        3.  **Content Integration:** Integrate the 'Final Marketing Content' as the main body. Extract key visual and style elements from 'Final Design Specifications' and apply them.
+        4.  **Image Integration:** Reference the generated image using its filename. Assume the image is in the same directory as the HTML.
+        5.  **Exclusion of Extraneous Content:** Your output MUST ONLY contain the HTML code. Do NOT include any conversational filler like "Here is the HTML:", "```html", or any explanations. Just the raw HTML.
+        6.  **HTML Structure:** Include standard email boilerplate (`<!DOCTYPE html>`, `<html>`, `<head>`, `<body>`).
+        7.  **Call to Action:** Implicitly create a call to action button if suggested in marketing content or based on common email practices.
+        8.  **Clean Content:** The Marketing Content might contain conversational filler from previous LLM interactions (e.g., "Here is the content:"). Remove such filler before integrating.
+        """
+
+@lru_cache(maxsize=256)
+def _read_cached(file_path: str, mtime_ns: int) -> str:
+    # mtime_ns is part of the cache key so a rewritten campaign file is re-read.
+    with open(file_path, "r") as f:
+        return f.read()
+
 class EmailMarketingDesignerAgent:
     def __init__(self, model_name: str = "gemini-pro"):
         """
@@ -13,18 +45,14 @@ class EmailMarketingDesignerAgent:
         Args:
             model_name (str): The name of the generative model to use.
         """
-        api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY or GOOGLE_API_KEY environment variable not set.")
-        
-        self.client = genai.Client(api_key=api_key)
+        self.client = get_genai_client()
+        self.cached_client = CachedGeminiClient(self.client)
         self.model_name = model_name
         
     def _read_file_content(self, file_path: str, default_content: str = "") -> str:
-        """Helper to read file content safely."""
+        """Helper to read file content safely. Unchanged files are served from memory."""
         if os.path.exists(file_path):
-            with open(file_path, "r") as f:
-                return f.read()
+            return _read_cached(file_path, os.stat(file_path).st_mtime_ns)
         return default_content
 
     def generate_email_html(self, state: dict) -> str:
@@ -32,39 +60,22 @@ class EmailMarketingDesignerAgent:
         Generates email-friendly HTML based on campaign content, design specs, and image.
         """
         print("--- Email Marketing Designer generating email HTML ---")
-        campaign_dir = state["campaign_dir"]
+        paths = campaign_paths(state["campaign_dir"])
         
         # Read final content and specs
-        campaign_goal_md = self._read_file_content(os.path.join(campaign_dir, "campaign_goal.md"))
-        research_context_md = self._read_file_content(os.path.join(campaign_dir, "research_context.md"))
-        marketing_content_final_md = self._read_file_content(os.path.join(campaign_dir, "marketing_content_FINAL.md"))
-        design_specs_final_md = self._read_file_content(os.path.join(campaign_dir, "design_specs_FINAL.md"))
+        campaign_goal_md = self._read_file_content(paths.goal)
+        research_context_md = self._read_file_content(paths.research)
+        marketing_content_final_md = self._read_file_content(paths.content_final)
+        design_specs_final_md = self._read_file_content(paths.specs_final)
         
         # Extract generated image path from its markdown file
-        generated_image_md_content = self._read_file_content(os.path.join(campaign_dir, "generated_image.md"))
-        generated_image_path = None
-        if "Image saved to:" in generated_image_md_content:
-            # Need to convert to relative path for HTML embedding
-            absolute_image_path = generated_image_md_content.split("Image saved to:")[1].strip()
-            generated_image_path = os.path.basename(absolute_image_path)
+        generated_image_md_content = self._read_file_content(paths.image_md)
+        # Need to convert to relative path for HTML embedding
+        image_match = _IMAGE_SAVED_RE.search(generated_image_md_content)
+        generated_image_path = os.path.basename(image_match.group(1)) if image_match else None
         
         # --- Prompt for LLM to generate Email HTML ---
-        system_instruction = f"""
-        You are an expert Email Marketing Designer. Your task is to generate a single, complete,
-        email-friendly HTML file based on the provided campaign content, design specifications,
-        and image path.
-
-        **CRITICAL INSTRUCTIONS for HTML Generation:**
-        1.  **Email Compatibility:** All CSS MUST be inlined. Use a table-based layout or modern, email-compatible CSS. Ensure cross-client compatibility.
-        2.  **Responsiveness:** Implement basic responsiveness (e.g., fluid images, max-width on containers).
-        3.  **Content Integration:** Integrate the 'Final Marketing Content' as the main body. Extract key visual and style elements from 'Final Design Specifications' and apply them.
-        4.  **Image Integration:** Reference the generated image using its filename. Assume the image is in the same directory as the HTML.
-        5.  **Exclusion of Extraneous Content:** Your output MUST ONLY contain the HTML code. Do NOT include any conversational filler like "Here is the HTML:", "```html", or any explanations. Just the raw HTML.
-        6.  **HTML Structure:** Include standard email boilerplate (`<!DOCTYPE html>`, `<html>`, `<head>`, `<body>`).
-        7.  **Call to Action:** Implicitly create a call to action button if suggested in marketing content or based on common email practices.
-        8.  **Clean Content:** The Marketing Content might contain conversational filler from previous LLM interactions (e.g., "Here is the content:"). Remove such filler before integrating.
-        """
-        
+        # The static instructions go out as the system turn; only the campaign material below varies.
         user_message = f"""
         **Campaign Goal:**
         {campaign_goal_md}
@@ -84,24 +95,18 @@ class EmailMarketingDesignerAgent:
         Please generate the complete, email-friendly HTML for this campaign.
         """
         
-        full_prompt = f"{system_instruction}\n\n{user_message}"
-
-        response = self.client.models.generate_content(
-            model=self.model_name,
-            contents=[full_prompt]
+        email_html_content = self.cached_client.generate(
+            self.model_name,
+            user_message,
+            system_instruction=EMAIL_DESIGNER_SYSTEM_INSTRUCTION
         )
         
-        email_html_content = response.text
-        
-        # Post-process to remove potential ```html wraps if LLM adds them
-        if email_html_content.strip().startswith("```html"):
-            email_html_content = email_html_content.strip()[len("```html"):]
-            if email_html_content.strip().endswith("```"):
-                email_html_content = email_html_content.strip()[:-len("```")]
+        # Remove a ```html fence if the LLM adds one, in a single pass
+        email_html_content = _FENCE_RE.sub('', email_html_content).strip()
 
-        email_html_path = os.path.join(campaign_dir, "email_campaign.html")
+        email_html_path = paths.email_html
         with open(email_html_path, "w") as f:
-            f.write(email_html_content.strip())
+            f.write(email_html_content)
             
         print(f"Email HTML generated at: {email_html_path}")
         return email_html_path
@@ -1,16 +1,27 @@
 import os
-from google import genai
+import re
 from dotenv import load_dotenv
 from typing import List, Dict, Any, Optional
 import json
 
 from src.config import TRUSTED_URLS, PROJECT_ROOT
-from src.utils.product_catalog import ProductCatalog
+from src.utils.product_catalog import load_catalog
+from src.utils.clients import get_genai_client
+from src.utils.llm_cache import CachedGeminiClient
 # Assuming these tools exist and are accessible through the workflow
 # (e.g., provided globally by the execution environment or framework)
 
 load_dotenv()
 
+# Leading and trailing ``` fences the LLM sometimes wraps its list in.
+_FENCE_RE = re.compile(r'^\s*```(?:\w+)?\s*|\s*```\s*$', re.DOTALL)
+# Text is split into sentences and lines (e.g. JSON values) before candidates are picked.
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+|\n')
+# A sentence could name a product if it has a ® or ™ mark, or a run of two to four capitalized words.
+_PRODUCT_CANDIDATE_RE = re.compile(r'®|™|\b[A-Z][A-Za-z]+(?:[ \t]+[A-Z][A-Za-z]+){1,3}\b')
+# Upper bound on candidate text sent for product-name extraction.
+PRODUCT_CANDIDATE_MAX_CHARS = 8000
+
 class FactCheckerAgent:
     def __init__(self, model_name: str = "gemini-2.5-pro"):
         """
@@ -18,21 +29,18 @@ class FactCheckerAgent:
         Args:
             model_name (str): The name of the generative model to use.
         """
-        api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY or GOOGLE_API_KEY environment variable not set.")
-        
-        self.client = genai.Client(api_key=api_key)
+        self.client = get_genai_client()
+        self.cached_client = CachedGeminiClient(self.client)
         self.model_name = model_name
         
-        # Initialize ProductCatalog
+        # Shared ProductCatalog, re-parsed only when the product files change
         products_dir = os.path.join(PROJECT_ROOT, "src", "data", "products")
-        self.product_catalog = ProductCatalog(products_dir)
+        self.product_catalog = load_catalog(products_dir)
 
 
-    def _extract_claims(self, content: str) -> List[str]:
-        """Uses LLM to extract factual claims from the given content."""
-        prompt = f"""
+    @staticmethod
+    def _claims_prompt(content: str) -> str:
+        return f"""
         Extract all distinct factual claims from the following content. A factual claim is a statement that can be proven true or false.
         List each claim on a new line. Do NOT include any conversational filler or explanations.
 
@@ -41,15 +49,10 @@ class FactCheckerAgent:
 
         Factual Claims:
         """
-        response = self.client.models.generate_content(model=self.model_name, contents=[prompt])
-        claims_text = response.text
-        return [claim.strip() for claim in claims_text.split('\n') if claim.strip()]
 
-    def _extract_and_verify_products(self, content: str) -> List[Dict[str, Any]]:
-        """
-        Uses LLM to extract potential product names from content and verifies their existence.
-        """
-        prompt = f"""
+    @staticmethod
+    def _products_prompt(content: str) -> str:
+        return f"""
         From the following content, identify any potential product names (e.g., brand names, specific product lines, or product names with trademarks like ®).
         List each identified product name on a new line. Do NOT include any conversational filler or explanations.
 
@@ -58,10 +61,25 @@ class FactCheckerAgent:
 
         Identified Product Names:
         """
-        response = self.client.models.generate_content(model=self.model_name, contents=[prompt])
-        identified_products_text = response.text
-        potential_product_names = [name.strip() for name in identified_products_text.split('\n') if name.strip()]
 
+    @staticmethod
+    def _lines(text: str) -> List[str]:
+        return [line.strip() for line in _FENCE_RE.sub('', text).split('\n') if line.strip()]
+
+    def _extract_claims(self, content: str) -> List[str]:
+        """Uses LLM to extract factual claims from the given content."""
+        return self._lines(self.cached_client.generate(self.model_name, self._claims_prompt(content)))
+
+    def _extract_and_verify_products(self, content: str) -> List[Dict[str, Any]]:
+        """
+        Uses LLM to extract potential product names from content and verifies their existence.
+        """
+        if not content:
+            return []
+        identified_products_text = self.cached_client.generate(self.model_name, self._products_prompt(content))
+        return self._verify_products(self._lines(identified_products_text))
+
+    def _verify_products(self, potential_product_names: List[str]) -> List[Dict[str, Any]]:
         verified_products = []
         for product_name in potential_product_names:
             exists = self.product_catalog.product_exists(product_name)
@@ -88,12 +106,23 @@ class FactCheckerAgent:
         Focuses on product existence verification.
         """
         print("--- FactCheckerAgent checking facts ---")
-        full_report_md = "# Fact-Checking Report\n\n"
+        content = self._content_for_products(campaign_goal, marketing_content, design_specs, research_context)
+        report = self._format_report(self._extract_and_verify_products(content))
+        print("Fact-checking complete.")
+        return report
 
-        # Product Existence Verification
-        all_content_for_products = f"Campaign Goal: {campaign_goal}\nMarketing Content: {marketing_content}\nDesign Specs: {design_specs}\nResearch Context: {research_context}"
-        product_checks = self._extract_and_verify_products(all_content_for_products)
-        
+    @staticmethod
+    def _content_for_products(campaign_goal: str, marketing_content: str, design_specs: str, research_context: str) -> str:
+        # Only the distinct sentences that could mention a product are sent, capped in length; most
+        # of the research context is irrelevant to product-name extraction. Empty means no candidates.
+        text = "\n".join((campaign_goal, marketing_content, design_specs, research_context))
+        sentences = (sentence.strip() for sentence in _SENTENCE_SPLIT_RE.split(text))
+        candidates = dict.fromkeys(sentence for sentence in sentences if _PRODUCT_CANDIDATE_RE.search(sentence))
+        return "\n".join(candidates)[:PRODUCT_CANDIDATE_MAX_CHARS]
+
+    @staticmethod
+    def _format_report(product_checks: List[Dict[str, Any]]) -> str:
+        full_report_md = "# Fact-Checking Report\n\n"
         full_report_md += "## Product Existence Verification\n\n"
         if not product_checks:
             full_report_md += "No explicit product mentions found to verify.\n"
@@ -106,6 +135,4 @@ class FactCheckerAgent:
                     if product_check["suggestion"]:
                         full_report_md += f"  **Suggestion:** {product_check['suggestion']}\n"
                 full_report_md += "\n"
-        
-        print("Fact-checking complete.")
         return full_report_md
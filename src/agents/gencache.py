@@ -0,0 +1,51 @@
+from __future__ import annotations
+import hashlib
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from langchain_core.prompts import ChatPromptTemplate
+
+def template_id(prompt: ChatPromptTemplate) -> str:
+    """
+    Stable identifier for a prompt template; changes whenever any message template text changes.
+    """
+    return hashlib.sha256(repr(prompt.messages).encode("utf-8")).hexdigest()[:16]
+
+def _normalize(value: str) -> str:
+    return " ".join(value.split()).casefold()
+
+class ListResponseCache:
+    """
+    Variation-aware cache for prompts that return a numbered list.
+
+    Entries are keyed by (template_id, slot values) where the count slot is left out: a cached
+    list of N items answers any request for <= N items by truncation, so asking for 3 posts
+    after planning 5 for the same goal/audience never reaches the LLM. Slot values are compared
+    after whitespace/case normalization; anything else is a miss.
+    """
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[str, ...], List[str]] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, template: str, slots: Tuple[str, ...]) -> Tuple[str, ...]:
+        return (template,) + tuple(_normalize(slot) for slot in slots)
+
+    def get(self, template: str, slots: Tuple[str, ...], count: int) -> Optional[List[str]]:
+        with self._lock:
+            items = self._entries.get(self._key(template, slots))
+        if items is None or len(items) < count:
+            return None
+        return items[:count]
+
+    def put(self, template: str, slots: Tuple[str, ...], items: List[str]) -> None:
+        key = self._key(template, slots)
+        with self._lock:
+            existing = self._entries.get(key)
+            # Keep the longest list seen so it can serve the widest range of counts.
+            if existing is not None and len(existing) >= len(items):
+                return
+            if existing is None and len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = list(items)
@@ -1,11 +1,17 @@
 import os
-from google import genai
+import time
+from google.genai import types
 from dotenv import load_dotenv
 from typing import Optional
+from src.utils.clients import get_genai_client
+from src.utils.llm_cache import CachedGeminiClient
 
 # Load environment variables
 load_dotenv()
 
+# Lifetime of the provider-side cache that holds the stylist's instructions and guidance document.
+GUIDANCE_CACHE_TTL_SECONDS = 3600
+
 class PhotographicStylist:
     def __init__(self, model_name: str = "gemini-2.5-flash"):
         """
@@ -13,13 +19,13 @@ class PhotographicStylist:
         Args:
             model_name (str): The name of the generative model to use for prompt enrichment.
         """
-        api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY or GOOGLE_API_KEY environment variable not set.")
-        
-        self.client = genai.Client(api_key=api_key)
+        self.client = get_genai_client()
+        self.cached_client = CachedGeminiClient(self.client)
         self.model_name = model_name
         self.guidance_content = self._load_guidance()
+        self.system_instruction = self._build_system_instruction()
+        self._guidance_cache_name: Optional[str] = None
+        self._guidance_cache_expires_at = 0.0
         
     def _load_guidance(self) -> str:
         """Loads the content of the IMAGE_PROMPTING_GUIDE.md."""
@@ -33,22 +39,9 @@ class PhotographicStylist:
         with open(guide_path, "r") as f:
             return f.read()
 
-    def enrich_prompt(self, base_prompt: str, artistic_direction: Optional[str] = None) -> str:
-        """
-        Enriches a base image prompt with detailed photographic terminology
-        based on the loaded guidance.
-        
-        Args:
-            base_prompt (str): The initial, concise image prompt.
-            artistic_direction (Optional[str]): Optional high-level artistic direction
-                                                (e.g., "cinematic", "natural lighting").
-        Returns:
-            str: The enriched prompt string.
-        """
-        print("Photographic Stylist enriching prompt...")
-        
-        # Construct the system instruction/context for the LLM
-        system_instruction = f"""
+    def _build_system_instruction(self) -> str:
+        """Builds the static system instruction once, so it is byte-identical on every call."""
+        return f"""
         You are an expert Photographic Stylist AI. Your task is to take a concise image generation request
         and expand it into a highly detailed, photography-specific prompt suitable for a Diffusion model
         like Stable Diffusion.
@@ -69,20 +62,59 @@ class PhotographicStylist:
         Include a "--neg" section for negative prompts at the end of the enriched prompt.
         Prioritize realism and artistic quality based on photographic best practices.
         """
+
+    def _guidance_cache(self) -> Optional[str]:
+        """
+        Returns the name of a provider-side cache holding the system instruction, creating or
+        refreshing it as it nears expiry. Returns None if the cache can't be created (e.g. the
+        model doesn't support it), in which case the instruction is sent with each request.
+        While the cache is live, requests carry only its name instead of the guidance document.
+        """
+        if time.time() < self._guidance_cache_expires_at:
+            return self._guidance_cache_name
+        # Refresh a minute early so no request references an expired cache; after a failed
+        # create, wait the same interval before trying again.
+        self._guidance_cache_expires_at = time.time() + GUIDANCE_CACHE_TTL_SECONDS - 60
+        try:
+            cache = self.client.caches.create(
+                model=self.model_name,
+                config=types.CreateCachedContentConfig(
+                    system_instruction=self.system_instruction,
+                    ttl=f"{GUIDANCE_CACHE_TTL_SECONDS}s"
+                )
+            )
+        except Exception as e:
+            print(f"Guidance cache unavailable, sending guidance inline: {e}")
+            self._guidance_cache_name = None
+            return None
+        self._guidance_cache_name = cache.name
+        return self._guidance_cache_name
+
+    def enrich_prompt(self, base_prompt: str, artistic_direction: Optional[str] = None) -> str:
+        """
+        Enriches a base image prompt with detailed photographic terminology
+        based on the loaded guidance.
+        
+        Args:
+            base_prompt (str): The initial, concise image prompt.
+            artistic_direction (Optional[str]): Optional high-level artistic direction
+                                                (e.g., "cinematic", "natural lighting").
+        Returns:
+            str: The enriched prompt string.
+        """
+        print("Photographic Stylist enriching prompt...")
         
         user_message = f"Base Prompt: {base_prompt}\n"
         if artistic_direction:
             user_message += f"Artistic Direction: {artistic_direction}\n"
         user_message += "Please provide the enriched image prompt:"
         
-        full_prompt = f"{system_instruction}\n\n{user_message}"
-        
-        response = self.client.models.generate_content(
-            model=self.model_name,
-            contents=[full_prompt]
+        enriched_prompt = self.cached_client.generate(
+            self.model_name,
+            user_message,
+            system_instruction=self.system_instruction,
+            cached_content=self._guidance_cache()
         )
-        
-        enriched_prompt = response.text
         print("Prompt enriched successfully.")
         return enriched_prompt
 
@@ -1,22 +1,13 @@
 import os
-from dotenv import load_dotenv # Added import
-from langchain_community.document_loaders import UnstructuredMarkdownLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_google_genai.embeddings import GoogleGenerativeAIEmbeddings
-from langchain_community.vectorstores import Chroma
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnablePassthrough
+from src.bootstrap import ensure_env
+from src.agents._llm import get_llm, with_retries
+from src.config import VECTORSTORE_COLLECTION
+from src.utils.clients import get_embeddings
 
-load_dotenv() # Load environment variables from .env
-
-# Ensure GOOGLE_API_KEY is set as an environment variable
-if not os.getenv("GOOGLE_API_KEY"):
-    raise ValueError("GOOGLE_API_KEY environment variable not set.")
-
-llm = ChatGoogleGenerativeAI(model="gemini-2.5-pro", temperature=0.7)
-embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
+ensure_env()
 
 class ResearcherAgent:
     def __init__(self, data_path: str = "src/data", persist_directory: str = "src/chroma_db"):
@@ -29,7 +20,7 @@ class ResearcherAgent:
             ("system", "You are an expert Marketing Researcher. Use the provided context to answer questions and provide relevant information for marketing campaigns. If the context does not contain the answer, state that you don't have enough information."),
             ("user", "Context: {context}\nQuestion: {question}")
         ])
-        self.chain = {"context": self.retriever, "question": RunnablePassthrough()} | self.prompt | llm | StrOutputParser()
+        self.chain = with_retries({"context": self.retriever, "question": RunnablePassthrough()} | self.prompt | get_llm("gemini-2.5-pro", 0.7) | StrOutputParser())
 
     def _initialize_vectorstore(self):
         """
@@ -42,7 +33,16 @@ class ResearcherAgent:
                 "Please run `python3 src/build_vectorstore.py` to build the knowledge base."
             )
         print(f"Loading existing vector store from {self.persist_directory}...")
-        vectorstore = Chroma(persist_directory=self.persist_directory, embedding_function=embeddings)
+        # Imported here: langchain_community (and Chroma's dependencies) is slow to import and only
+        # needed once a researcher is actually built.
+        from langchain_community.vectorstores import Chroma
+        # Chroma serves queries from a persisted HNSW index (hnswlib), so lookups are already
+        # approximate-nearest-neighbour rather than a scan over every chunk.
+        vectorstore = Chroma(
+            collection_name=VECTORSTORE_COLLECTION,
+            persist_directory=self.persist_directory,
+            embedding_function=get_embeddings(),
+        )
         return vectorstore
 
     def research(self, query: str) -> str:
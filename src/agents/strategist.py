@@ -1,17 +1,9 @@
-import os
-from dotenv import load_dotenv # Added import
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_google_genai import ChatGoogleGenerativeAI
+from src.bootstrap import ensure_env
+from src.agents._llm import get_llm, with_retries
 
-load_dotenv() # Load environment variables from .env
-
-# Ensure GOOGLE_API_KEY is set as an environment variable
-# You can get one from https://ai.google.dev/
-if not os.getenv("GOOGLE_API_KEY"):
-    raise ValueError("GOOGLE_API_KEY environment variable not set.")
-
-llm = ChatGoogleGenerativeAI(model="gemini-pro-latest", temperature=0.7)
+ensure_env()
 
 class StrategistAgent:
     def __init__(self):
@@ -22,7 +14,7 @@ class StrategistAgent:
             """),
             ("user", "Refine the following marketing objective into a concise campaign goal: {objective}")
         ])
-        self.chain = self.prompt | llm | StrOutputParser()
+        self.chain = with_retries(self.prompt | get_llm("gemini-pro-latest", 0.7) | StrOutputParser())
 
     def refine_goal(self, objective: str) -> str:
         """
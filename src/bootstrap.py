@@ -0,0 +1,16 @@
+import os
+from functools import lru_cache
+from dotenv import load_dotenv
+
+REQUIRED_ENV_VARS = ("GOOGLE_API_KEY",)
+
+@lru_cache(maxsize=1)
+def ensure_env() -> None:
+    """
+    Loads .env once per process (never overriding variables already set) and checks that the
+    required keys are present. Safe to call from every module; only the first call does any work.
+    """
+    load_dotenv(override=False)
+    missing = [name for name in REQUIRED_ENV_VARS if not os.getenv(name)]
+    if missing:
+        raise ValueError(f"{', '.join(missing)} environment variable not set.")
@@ -1,21 +1,27 @@
 import os
-from dotenv import load_dotenv
-from langchain_community.document_loaders import WebBaseLoader, UnstructuredMarkdownLoader
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List
+from langchain_core.documents import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from langchain_community.vectorstores import Chroma
-from src.config import TRUSTED_URLS, DATA_PATH, PERSIST_DIRECTORY, SCREENSHOTS_DIR, PROJECT_ROOT
+from src.config import TRUSTED_URLS, DATA_PATH, PERSIST_DIRECTORY, VECTORSTORE_COLLECTION, SCREENSHOTS_DIR, PROJECT_ROOT
 from src.tools.product_crawler import crawl_and_extract
 from src.agents.design_analyst import DesignAnalystAgent # Added import
 from src.utils.product_catalog import ProductCatalog # NEW IMPORT
+from src.bootstrap import ensure_env
+from src.utils.clients import get_embeddings
 
-load_dotenv()
+ensure_env()
 
-# Ensure GOOGLE_API_KEY is set as an environment variable
-if not os.getenv("GOOGLE_API_KEY"):
-    raise ValueError("GOOGLE_API_KEY environment variable not set.")
+# Upper bound on texts per embedding request accepted by the Gemini embedding API.
+EMBED_BATCH_SIZE = 100
 
-llm_embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
+# Splitting is per document, so local files are split in the same worker that parsed them.
+_TEXT_SPLITTER = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+
+def _load_and_split(file_path: str) -> List[Document]:
+    from langchain_community.document_loaders import UnstructuredMarkdownLoader
+    return _TEXT_SPLITTER.split_documents(UnstructuredMarkdownLoader(file_path).load())
 
 def build_vectorstore():
     """
@@ -26,6 +32,10 @@ def build_vectorstore():
     4. Loads content from trusted URLs.
     5. Creates and persists the vector store.
     """
+    # The loaders and Chroma pull in heavy dependencies, so they're imported only when a build runs.
+    import chromadb
+    from langchain_community.document_loaders import WebBaseLoader
+
     print("--- Step 1: Crawling for verified product information ---")
     crawl_and_extract()
     print("--- Product crawl complete ---")
@@ -50,8 +60,6 @@ def build_vectorstore():
 
     print("\n--- Step 3: Building/updating vector store ---")
 
-    documents = []
-
     # Initialize ProductCatalog
     products_dir = os.path.join(PROJECT_ROOT, "src", "data", "products")
     product_catalog = ProductCatalog(products_dir)
@@ -63,45 +71,71 @@ def build_vectorstore():
         current_design_system_path, # Path to the generated design system
     ]
 
-    # Load all product markdown files
+    # Load all product markdown files. Unstructured parsing is CPU-bound and files are independent,
+    # so they are parsed across worker processes.
     print(f"Loading product markdown documents from {products_dir}...")
-    for product_filename in os.listdir(products_dir):
-        if product_filename.endswith(".md"):
-            file_path = os.path.join(products_dir, product_filename)
-            loader = UnstructuredMarkdownLoader(file_path)
-            documents.extend(loader.load())
+    product_paths = [
+        os.path.join(products_dir, product_filename)
+        for product_filename in os.listdir(products_dir)
+        if product_filename.endswith(".md")
+    ]
 
     print(f"Loading other specific markdown documents...")
+    existing_md_files = []
     for file_path in md_files_to_load:
         if os.path.exists(file_path):
-            loader = UnstructuredMarkdownLoader(file_path)
-            documents.extend(loader.load())
+            existing_md_files.append(file_path)
         else:
             print(f"Warning: Markdown file not found: {file_path}")
 
-    print(f"Loaded {len(documents)} local markdown documents.")
+    splits = []
+    with ProcessPoolExecutor() as executor:
+        for file_splits in executor.map(_load_and_split, product_paths + existing_md_files):
+            splits.extend(file_splits)
+
+    print(f"Loaded and split {len(product_paths) + len(existing_md_files)} local markdown documents into {len(splits)} chunks.")
 
     # Load web content from trusted URLs
     print(f"Loading content from trusted URLs: {TRUSTED_URLS}...")
-    web_loader = WebBaseLoader(TRUSTED_URLS)
-    web_documents = web_loader.load()
-    documents.extend(web_documents)
-    print(f"Loaded {len(web_documents)} web documents. Total documents: {len(documents)}")
-
-    # Split documents
-    print("Splitting documents into chunks...")
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-    splits = text_splitter.split_documents(documents)
-    print(f"Split into {len(splits)} chunks.")
+    # Fetched concurrently, one loader per URL; documents keep TRUSTED_URLS order.
+    web_documents = []
+    with ThreadPoolExecutor(max_workers=max(len(TRUSTED_URLS), 1)) as executor:
+        for url_documents in executor.map(lambda url: WebBaseLoader(url).load(), TRUSTED_URLS):
+            web_documents.extend(url_documents)
+    print(f"Loaded {len(web_documents)} web documents.")
+
+    # Split web documents (local files were split as they were loaded)
+    print("Splitting web documents into chunks...")
+    splits.extend(_TEXT_SPLITTER.split_documents(web_documents))
+    print(f"Split into {len(splits)} chunks in total.")
+
+    # Embed all chunks up front in requests of EMBED_BATCH_SIZE, then add the precomputed vectors
+    # directly so Chroma doesn't run its own per-call embedding path.
+    texts = [split.page_content for split in splits]
+    metadatas = [split.metadata for split in splits]
+    print(f"Embedding {len(texts)} chunks in batches of {EMBED_BATCH_SIZE}...")
+    llm_embeddings = get_embeddings()
+    embeddings = []
+    for start in range(0, len(texts), EMBED_BATCH_SIZE):
+        embeddings.extend(llm_embeddings.embed_documents(texts[start:start + EMBED_BATCH_SIZE]))
 
     # Create and persist vector store
     print("Creating/updating ChromaDB vector store...")
-    vectorstore = Chroma.from_documents(
-        documents=splits,
-        embedding=llm_embeddings,
-        persist_directory=PERSIST_DIRECTORY
-    )
-    vectorstore.persist()
+    client = chromadb.PersistentClient(path=PERSIST_DIRECTORY)
+    # Vectors are precomputed above, so the collection gets no embedding function of its own.
+    collection = client.get_or_create_collection(name=VECTORSTORE_COLLECTION, embedding_function=None)
+    # One add per max batch (the whole corpus in practice): Chroma writes each add in a single
+    # transaction, but rejects adds larger than its SQLite-bound batch limit.
+    ids = [str(uuid.uuid4()) for _ in texts]
+    max_batch_size = client.get_max_batch_size()
+    for start in range(0, len(texts), max_batch_size):
+        end = start + max_batch_size
+        collection.add(
+            ids=ids[start:end],
+            embeddings=embeddings[start:end],
+            documents=texts[start:end],
+            metadatas=metadatas[start:end],
+        )
     print(f"Vector store built/updated successfully at {PERSIST_DIRECTORY}")
 
 if __name__ == "__main__":
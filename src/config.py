@@ -7,6 +7,7 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_PATH = os.path.join(PROJECT_ROOT, "src", "data")
 PRODUCT_DIR = os.path.join(DATA_PATH, "products")
 PERSIST_DIRECTORY = os.path.join(PROJECT_ROOT, "src", "chroma_db")
+VECTORSTORE_COLLECTION = "langchain" # LangChain's default Chroma collection, which the researcher queries
 BUDGET_FILE = os.path.join(DATA_PATH, "generation_budget.json")
 SCREENSHOTS_DIR = os.path.join(PROJECT_ROOT, "screenshots") # New path
 
@@ -34,4 +35,20 @@ BUDGET_CONFIG = {
 }
 
 # Refinement Loop Configuration
-MAX_ITERATIONS = 1 # Maximum number of refinement iterations
\ No newline at end of file
+MAX_ITERATIONS = 1 # Maximum number of refinement iterations
+
+# Multi-Post Campaign Configuration
+MULTI_POST_CONCURRENCY = 4 # Posts of a multi-post campaign run at once (each makes several LLM/image calls)
+
+# LLM Batching Configuration
+LLM_BATCH_MAX_CONCURRENCY = 10 # Max concurrent Gemini requests when an agent batches calls
+LLM_LONG_BATCH_MAX_CONCURRENCY = 16 # Long-form generations (video scripts) all start at once so none trails the batch
+
+# LLM Resilience Configuration
+LLM_REQUEST_TIMEOUT_SECONDS = 30.0 # Hard timeout per Gemini request before failing over
+LLM_MAX_ATTEMPTS = 3 # Attempts per agent chain call (with jittered exponential backoff)
+
+# google-genai Client Configuration
+GENAI_REQUEST_TIMEOUT_SECONDS = 60.0 # Per-request timeout; image generation is slower than text calls
+GENAI_MAX_KEEPALIVE_CONNECTIONS = 32 # Idle connections kept open for reuse across agent calls
+GENAI_KEEPALIVE_EXPIRY_SECONDS = 300.0 # How long an idle connection stays in the pool
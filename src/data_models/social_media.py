@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, HttpUrl, root_validator
+from pydantic import BaseModel, Field, HttpUrl, RootModel, root_validator
 from typing import List, Optional, Union, Literal # Added Literal
 from datetime import datetime
 
@@ -18,6 +18,11 @@ class SocialMediaPostDraft(BaseModel):
     call_to_action_text: Optional[str] = Field(None, description="Call to action text (e.g., 'Shop Now', 'Learn More').")
     call_to_action_url: Optional[HttpUrl] = Field(None, description="URL for the call to action.")
 
+class SocialMediaPostDraftList(RootModel[List[SocialMediaPostDraft]]):
+    """
+    A JSON list of drafts, used when several post objectives are drafted in a single LLM request.
+    """
+
 class SocialMediaPost(BaseModel):
     """
     Final data structure for a social media post, containing common fields.
@@ -41,6 +46,15 @@ class SocialMediaPost(BaseModel):
             raise ValueError("A social media post cannot have both images and a video (choose one).")
         return values
 
+    @classmethod
+    def from_trusted(cls, data: dict):
+        """
+        Builds a post from data that is already trusted (e.g. fields of a validated post, or a
+        placeholder the workflow creates itself) without running field or media validation.
+        Untrusted LLM output should go through normal construction instead.
+        """
+        return cls.model_construct(**data)
+
 # --- Platform-Specific Models ---
 
 class InstagramPost(SocialMediaPost):
@@ -55,8 +69,7 @@ class InstagramPost(SocialMediaPost):
     
     @root_validator(skip_on_failure=True)
     def check_instagram_media(cls, values):
-        if not values.get('image_paths') and not values.get('video_path'):
-            raise ValueError("Instagram posts must have either images or a video.")
+        # Presence of media is already enforced by SocialMediaPost.check_media_content.
         if values.get('image_paths') and len(values['image_paths']) > 10:
             raise ValueError("Instagram posts can have a maximum of 10 images in a carousel.")
         return values
@@ -1,4 +1,6 @@
+import asyncio
 import operator
+from concurrent.futures import ThreadPoolExecutor
 from typing import TypedDict, Optional, List
 import re
 import os
@@ -16,7 +18,7 @@ from src.agents.strategist import StrategistAgent
 from src.agents.researcher import ResearcherAgent
 from src.agents.copywriter import CopywriterAgent
 from src.agents.creative_director import CreativeDirectorAgent
-from src.agents.critic import CriticAgent # Added import
+from src.agents.critic import CriticAgent, NO_FURTHER_IMPROVEMENTS, is_high_stakes # Added import
 from src.agents.fact_checker import FactCheckerAgent # NEW IMPORT
 from src.agents.content_planner import ContentPlannerAgent # NEW IMPORT
 from src.tools.image_generation import generate_image
@@ -28,7 +30,7 @@ from src.tools.generation_budget_manager import (
     estimate_llm_cost,
     estimate_embedding_cost, # Added import
 )
-from src.config import MAX_ITERATIONS # Added import
+from src.config import MAX_ITERATIONS, MULTI_POST_CONCURRENCY # Added import
 from src.tools.html_bundler import generate_html_report, generate_pdf_report # NEW IMPORT
 
 load_dotenv()
@@ -44,6 +46,7 @@ class AgentState(TypedDict):
     post_objectives: List[str] # List of individual post objectives generated by ContentPlanner
     current_post_index: int # Index of the post currently being processed
     all_post_results: List[dict] # To store results of each individual post'
+    post_concurrency: int # Max posts run concurrently (defaults to MULTI_POST_CONCURRENCY)
     overall_campaign_dir: str # NEW: The base directory for the entire multi-post campaign
     
     campaign_goal: str
@@ -77,8 +80,9 @@ def budget_check_node(state):
     # If no_copywriting and reference_image_path, pre-populate design_specs to trigger image generation
     if state.get("no_copywriting") and state.get("reference_image_path"):
         print("No-copywriting flag active with reference image. Skipping content generation agents.")
-        # Create a dummy SocialMediaPost
-        dummy_social_media_post = SocialMediaPost(
+        # Create a dummy SocialMediaPost. It is a trusted placeholder with no media yet, so it is
+        # built without validation (which would reject a post without images or video).
+        dummy_social_media_post = SocialMediaPost.from_trusted(dict(
             platform="instagram", # Default platform, can be generalized
             text_content=f"Campaign for {state['campaign_goal']}. Content skipped due to no-copywriting flag.",
             image_paths=[],
@@ -87,7 +91,7 @@ def budget_check_node(state):
             mentions=[],
             call_to_action_text=None,
             call_to_action_url=None
-        )
+        ))
         # Create a DesignSpecification with the image generation prompt
         design_spec = DesignSpecification(
             overall_visual_concept=f"Image for campaign goal: {state['campaign_goal']}",
@@ -132,52 +136,43 @@ def researcher_node(state):
         "cumulative_daily_spend": get_budget_status(),
     }
 
-def copywriter_node(state):
-    print(f"--- Running Copywriter (Iteration {state['iteration_count'] + 1}) ---")
+def draft_node(state):
+    print(f"--- Running Copywriter and Creative Director (Iteration {state['iteration_count'] + 1}) ---")
     
     feedback_context = f"\nPrevious Critique: {state['critique_feedback']}" if state["critique_feedback"] else ""
+    research_context = state["research_context"] + feedback_context
     
-    # The CopywriterAgent now directly returns a SocialMediaPost Pydantic object
-    social_media_post_draft: SocialMediaPostDraft = CopywriterAgent().draft_content(state["campaign_goal"], state["research_context"] + feedback_context)
+    # Copy and design specs only depend on the goal, research and critique, so both LLM calls run
+    # concurrently. The agents return SocialMediaPostDraft and DesignSpecification Pydantic objects.
+    async def draft_copy_and_design():
+        return await asyncio.gather(
+            CopywriterAgent().adraft_content(state["campaign_goal"], research_context),
+            CreativeDirectorAgent().agenerate_design_specs(
+                state["campaign_goal"],
+                research_context,
+                reference_image_path=state.get("reference_image_path") # Pass reference image path
+            ),
+        )
+    social_media_post_draft, design_spec = asyncio.run(draft_copy_and_design())
     
-    # Calculate cost based on the text_content of the generated post
-    cost = estimate_llm_cost("gemini-pro-latest", f"Campaign Goal: {state['campaign_goal']}\nResearch Context: {state['research_context']}\nFeedback: {feedback_context}", social_media_post_draft.model_dump_json())
-    record_generation(cost, "CopywriterAgent")
+    # Calculate each agent's cost from its serialized output
+    cost_input = f"Campaign Goal: {state['campaign_goal']}\nResearch Context: {state['research_context']}\nFeedback: {feedback_context}"
+    copywriter_cost = estimate_llm_cost("gemini-pro-latest", cost_input, social_media_post_draft.model_dump_json())
+    record_generation(copywriter_cost, "CopywriterAgent")
+    creative_director_cost = estimate_llm_cost("gemini-pro-latest", cost_input, design_spec.model_dump_json())
+    record_generation(creative_director_cost, "CreativeDirectorAgent")
     
-    # Append current version to history
+    # Append current versions to history
     # Note: marketing_content_versions will temporarily hold SocialMediaPostDraft until combine_post_media_node
     marketing_content_versions = state.get("marketing_content_versions", []) + [social_media_post_draft]
+    design_specs_versions = state.get("design_specs_versions", []) + [design_spec]
     
     return {
         "marketing_content": social_media_post_draft, # Temporarily store the draft
         "marketing_content_versions": marketing_content_versions,
-        "last_action_cost": cost,
-        "cumulative_daily_spend": get_budget_status(),
-    }
-
-def creative_director_node(state):
-    print(f"--- Running Creative Director (Iteration {state['iteration_count'] + 1}) ---")
-    
-    feedback_context = f"\nPrevious Critique: {state['critique_feedback']}" if state["critique_feedback"] else ""
-    
-    # The CreativeDirectorAgent now directly returns a DesignSpecification Pydantic object
-    design_spec: DesignSpecification = CreativeDirectorAgent().generate_design_specs(
-        state["campaign_goal"],
-        state["research_context"] + feedback_context,
-        reference_image_path=state.get("reference_image_path") # Pass reference image path
-    )
-    
-    # Calculate cost based on the string representation of the generated design_spec
-    cost = estimate_llm_cost("gemini-pro-latest", f"Campaign Goal: {state['campaign_goal']}\nResearch Context: {state['research_context']}\nFeedback: {feedback_context}", design_spec.model_dump_json())
-    record_generation(cost, "CreativeDirectorAgent")
-    
-    # Append current version to history
-    design_specs_versions = state.get("design_specs_versions", []) + [design_spec]
-    
-    return {
         "design_specs": design_spec,
         "design_specs_versions": design_specs_versions,
-        "last_action_cost": cost,
+        "last_action_cost": copywriter_cost + creative_director_cost,
         "cumulative_daily_spend": get_budget_status(),
     }
 
@@ -197,20 +192,41 @@ def critic_node(state):
         f"Design Specs:\n{design_specs_json}"
     )
     
-    critique_feedback = critic_agent.critique(
+    # Fact-checking doesn't depend on the critique, so it runs in a worker thread while the
+    # critique streams.
+    fact_check_executor = ThreadPoolExecutor(max_workers=1)
+    fact_check_future = fact_check_executor.submit(
+        fact_checker_agent.check_facts,
         state["campaign_goal"],
-        state["research_context"],
         marketing_content_json,
-        design_specs_json
+        design_specs_json,
+        state["research_context"]
     )
+    fact_check_executor.shutdown(wait=False)
+
+    # The final pass and goals with legal or health claims are critiqued by the pro model.
+    high_stakes = state["iteration_count"] + 1 >= MAX_ITERATIONS or is_high_stakes(state["campaign_goal"])
 
-    # Perform fact-checking and append to critique_feedback
-    fact_checking_report = fact_checker_agent.check_facts(
+    # Stream the critique and stop as soon as the critic signs off; nothing after the sentinel
+    # changes the refinement decision.
+    critique_feedback = ""
+    critique_stream = critic_agent.critique_stream(
         state["campaign_goal"],
+        state["research_context"],
         marketing_content_json,
         design_specs_json,
-        state["research_context"]
+        high_stakes=high_stakes
     )
+    try:
+        for chunk in critique_stream:
+            critique_feedback += chunk
+            if NO_FURTHER_IMPROVEMENTS in critique_feedback[-(len(chunk) + len(NO_FURTHER_IMPROVEMENTS)):]:
+                break
+    finally:
+        critique_stream.close()
+
+    # Append the fact-checking report to critique_feedback
+    fact_checking_report = fact_check_future.result()
 
     full_feedback = f"{critique_feedback}\n\n{fact_checking_report}"
     
@@ -420,7 +436,7 @@ def should_continue_refinement(state):
     if state["iteration_count"] >= MAX_ITERATIONS:
         print(f"Max iterations ({MAX_ITERATIONS}) reached. Ending refinement loop.")
         return "end_refinement"
-    if "No further improvements needed." in state["critique_feedback"]:
+    if NO_FURTHER_IMPROVEMENTS in state["critique_feedback"]:
         print("Critic is satisfied. Ending refinement loop.")
         return "end_refinement"
     return "refine" # Loop back for refinement
@@ -449,10 +465,8 @@ def create_single_post_workflow():
     workflow.add_node("report_strategist_cost", report_cost_node)
     workflow.add_node("researcher", researcher_node)
     workflow.add_node("report_researcher_cost", report_cost_node)
-    workflow.add_node("copywriter", copywriter_node)
-    workflow.add_node("report_copywriter_cost", report_cost_node)
-    workflow.add_node("creative_director", creative_director_node)
-    workflow.add_node("report_creative_director_cost", report_cost_node)
+    workflow.add_node("draft", draft_node)
+    workflow.add_node("report_draft_cost", report_cost_node)
     workflow.add_node("critic", critic_node) # New node
     workflow.add_node("report_critic_cost", report_cost_node) # New node
     workflow.add_node("media_generator", media_generator_node)
@@ -478,11 +492,9 @@ def create_single_post_workflow():
     workflow.add_edge("researcher", "report_researcher_cost")
     
     # Initial pass for content and design
-    workflow.add_edge("report_researcher_cost", "copywriter")
-    workflow.add_edge("copywriter", "report_copywriter_cost")
-    workflow.add_edge("report_copywriter_cost", "creative_director")
-    workflow.add_edge("creative_director", "report_creative_director_cost")
-    workflow.add_edge("report_creative_director_cost", "critic")
+    workflow.add_edge("report_researcher_cost", "draft")
+    workflow.add_edge("draft", "report_draft_cost")
+    workflow.add_edge("report_draft_cost", "critic")
     workflow.add_edge("critic", "report_critic_cost")
 
     # Refinement loop
@@ -490,7 +502,7 @@ def create_single_post_workflow():
         "report_critic_cost",
         should_continue_refinement,
         {
-            "refine": "copywriter", # Loop back for refinement
+            "refine": "draft", # Loop back for refinement
             "end_refinement": "check_media_or_design_change", # Proceed to media/design change check
         }
     )
@@ -517,30 +529,82 @@ def create_single_post_workflow():
 
     return workflow.compile()
 
+def _single_post_state(state, post_index: int, post_objective: str) -> dict:
+    """
+    Builds the input state for one post of a multi-post campaign, with its own output directory
+    and fresh per-post fields.
+    """
+    post_campaign_dir = os.path.join(state["overall_campaign_dir"], f"post_{post_index + 1}")
+    os.makedirs(post_campaign_dir, exist_ok=True)
+    return {
+        **state,
+        "current_post_index": post_index,
+        "campaign_goal": post_objective,
+        "campaign_dir": post_campaign_dir,
+        "research_context": "",
+        "marketing_content": None,
+        "design_specs": None,
+        "generated_image_path": None,
+        "generated_video_path": None,
+        "html_report_path": None,
+        "pdf_report_path": None,
+        "marketing_content_versions": [],
+        "design_specs_versions": [],
+        "critique_feedback": "",
+        "iteration_count": 0,
+        "last_action_cost": 0,
+    }
+
+def run_posts_node(state, single_post_subgraph):
+    """
+    Runs the single-post workflow for every planned post objective concurrently, at most
+    post_concurrency at a time. A post that fails is reported in its result instead of aborting
+    the other posts. Results come back in objective order.
+    """
+    post_objectives = state.get("post_objectives", [])
+    max_concurrency = state.get("post_concurrency") or MULTI_POST_CONCURRENCY
+    print(f"--- Running {len(post_objectives)} posts ({max_concurrency} at a time) ---")
+    post_states = [_single_post_state(state, i, objective) for i, objective in enumerate(post_objectives)]
+    final_states = single_post_subgraph.batch(
+        post_states,
+        config={"max_concurrency": max_concurrency},
+        return_exceptions=True,
+    )
+
+    all_post_results = []
+    for post_state, final_state in zip(post_states, final_states):
+        post_result = {"post_objective": post_state["campaign_goal"], "campaign_dir": post_state["campaign_dir"]}
+        if isinstance(final_state, Exception):
+            print(f"Post '{post_state['campaign_goal']}' failed: {final_state}")
+            post_result["error"] = str(final_state)
+        else:
+            post_result.update(
+                generated_image_path=final_state.get("generated_image_path"),
+                html_report_path=final_state.get("html_report_path"),
+                pdf_report_path=final_state.get("pdf_report_path"),
+            )
+        all_post_results.append(post_result)
+
+    # Per-post spend is recorded by each node through the budget manager; read the total once.
+    return {
+        "all_post_results": all_post_results,
+        "current_post_index": len(post_objectives),
+        "cumulative_daily_spend": get_budget_status(),
+    }
+
 def create_multi_post_workflow():
     single_post_subgraph = create_single_post_workflow()
 
     multi_post_workflow = StateGraph(AgentState)
 
     multi_post_workflow.add_node("plan_posts", plan_posts_node)
-    multi_post_workflow.add_node("prepare_single_post_state", prepare_single_post_state_node)
-    multi_post_workflow.add_node("run_single_post_workflow", lambda state: single_post_subgraph.invoke(state))
-    multi_post_workflow.add_node("collect_single_post_results", collect_single_post_results_node)
+    # Posts are independent, so they fan out across one node instead of looping one at a time.
+    multi_post_workflow.add_node("run_posts", lambda state: run_posts_node(state, single_post_subgraph))
     multi_post_workflow.add_node("final_multi_post_report", final_multi_post_report_node)
 
     multi_post_workflow.set_entry_point("plan_posts")
-    multi_post_workflow.add_edge("plan_posts", "prepare_single_post_state")
-    multi_post_workflow.add_edge("prepare_single_post_state", "run_single_post_workflow")
-    multi_post_workflow.add_edge("run_single_post_workflow", "collect_single_post_results")
-
-    multi_post_workflow.add_conditional_edges(
-        "collect_single_post_results",
-        should_continue_posts,
-        {
-            "continue": "prepare_single_post_state",
-            "end": "final_multi_post_report"
-        }
-    )
+    multi_post_workflow.add_edge("plan_posts", "run_posts")
+    multi_post_workflow.add_edge("run_posts", "final_multi_post_report")
     multi_post_workflow.add_edge("final_multi_post_report", END)
 
     return multi_post_workflow.compile()
@@ -600,7 +664,7 @@ if __name__ == "__main__":
         "cumulative_daily_spend": get_budget_status(), # Initial budget status
         "last_action_cost": 0,
         
-        # Default values for single_post_workflow, will be overwritten by prepare_single_post_state_node
+        # Default values for single_post_workflow; _single_post_state overwrites them for each post
         "campaign_goal": "", 
         "research_context": "",
         "marketing_content": None,
@@ -2,25 +2,34 @@ import sys
 import importlib
 import json
 import os
+from functools import lru_cache
 
 # Add the parent directory of src/tools to the Python path
 # This allows importing tools like `from tools import email_sender_tool`
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+@lru_cache(maxsize=None)
+def _resolve_tool(tool_name: str):
+    """
+    Imports src.tools.<tool_name> and returns a shared instance of its tool class, so repeated
+    dispatches in one process skip the import, class lookup and construction.
+    """
+    # Construct the module path for the tool
+    # Assuming tools are in src/tools/ and are named like tool_name.py
+    module_path = f"src.tools.{tool_name}"
+    tool_module = importlib.import_module(module_path)
+
+    # Assuming the tool class or function has the same name as the tool_name (e.g., EmailSenderTool in email_sender_tool.py)
+    # Or a common 'run' function
+    tool_class_name = ''.join(word.capitalize() for word in tool_name.split('_'))
+    return getattr(tool_module, tool_class_name)() # Assuming it's a class and needs instantiation
+
 def dispatch_tool_call(tool_name: str, params_json: str):
     """
     Dispatches a call to a specified Python tool with given parameters.
     """
     try:
-        # Construct the module path for the tool
-        # Assuming tools are in src/tools/ and are named like tool_name.py
-        module_path = f"src.tools.{tool_name}"
-        tool_module = importlib.import_module(module_path)
-
-        # Assuming the tool class or function has the same name as the tool_name (e.g., EmailSenderTool in email_sender_tool.py)
-        # Or a common 'run' function
-        tool_class_name = ''.join(word.capitalize() for word in tool_name.split('_'))
-        tool_instance = getattr(tool_module, tool_class_name)() # Assuming it's a class and needs instantiation
+        tool_instance = _resolve_tool(tool_name)
 
         params = json.loads(params_json)
 
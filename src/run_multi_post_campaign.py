@@ -4,6 +4,7 @@ from datetime import datetime
 
 from src.graph import create_multi_post_workflow, AgentState
 from src.tools.generation_budget_manager import get_budget_status
+from src.config import MULTI_POST_CONCURRENCY
 
 def main():
     parser = argparse.ArgumentParser(description="Run a multi-post social media campaign.")
@@ -25,6 +26,12 @@ def main():
         default=20,
         help="The desired number of social media posts to generate (default: 20).",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=MULTI_POST_CONCURRENCY,
+        help=f"The number of posts to generate at the same time (default: {MULTI_POST_CONCURRENCY}).",
+    )
     parser.add_argument(
         "--output_dir",
         type=str,
@@ -67,6 +74,7 @@ def main():
         "overall_campaign_goal": args.overall_campaign_goal,
         "target_audience": args.target_audience,
         "num_posts": args.num_posts,
+        "post_concurrency": args.concurrency,
         "campaign_dir": multi_post_campaign_dir, # This is the overall campaign directory
         "overall_campaign_dir": multi_post_campaign_dir, # Also pass this for final report node
         "post_objectives": [], # Will be populated by plan_posts_node
@@ -75,7 +83,7 @@ def main():
         "cumulative_daily_spend": get_budget_status(), # Initial budget status
         "last_action_cost": 0,
         
-        # Default values for single_post_workflow, will be overwritten by prepare_single_post_state_node
+        # Default values for single_post_workflow; _single_post_state overwrites them for each post
         "campaign_goal": "", 
         "research_context": "",
         "marketing_content": "",
@@ -0,0 +1,47 @@
+import hashlib
+import os
+import time
+from src.config import SCREENSHOTS_DIR
+from src.tools.screenshot_tool import take_screenshot
+from src.tools.css_analyzer import get_all_css
+
+# Rendered screenshots and crawled CSS for a URL change rarely, so repeat analyses within the TTL
+# reuse the previous capture instead of relaunching the browser and re-fetching every stylesheet.
+SNAPSHOT_CACHE_DIR = os.path.join(SCREENSHOTS_DIR, ".snapshot_cache")
+DEFAULT_TTL_SECONDS = 86400
+
+def _url_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+
+def _is_fresh(path: str, ttl: int) -> bool:
+    try:
+        return time.time() - os.path.getmtime(path) < ttl
+    except OSError:
+        return False
+
+def cached_screenshot(url: str, output_path: str, ttl: int = DEFAULT_TTL_SECONDS) -> str:
+    """
+    Returns output_path, taking a new screenshot only if there is no capture there younger than ttl seconds.
+    """
+    if not _is_fresh(output_path, ttl):
+        take_screenshot(url, output_path)
+    return output_path
+
+def cached_css(url: str, ttl: int = DEFAULT_TTL_SECONDS) -> str:
+    """
+    Returns the combined CSS for url, re-crawling only if the cached copy is older than ttl seconds.
+    Empty results (failed fetches) are not cached.
+    """
+    cache_path = os.path.join(SNAPSHOT_CACHE_DIR, f"{_url_key(url)}.css")
+    if _is_fresh(cache_path, ttl):
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    css_content = get_all_css(url)
+    if css_content:
+        os.makedirs(SNAPSHOT_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(css_content)
+        os.replace(tmp_path, cache_path)
+    return css_content
@@ -0,0 +1,61 @@
+import json
+import re
+from typing import Dict, List, Set, Tuple
+
+# Declarations the design-system template actually asks about; everything else (resets, layout
+# utilities, animations, vendor hacks) is dropped before the CSS reaches the prompt.
+_KEEP_PROPERTY_RE = re.compile(
+    r"^(?:color|background(?:-color)?|font-(?:family|size|weight)"
+    r"|padding(?:-\w+)?|margin(?:-\w+)?|border(?:-\w+)*-radius)$"
+)
+_BRACE_RE = re.compile(r"[{}]")
+
+def filter_css(css: str) -> str:
+    """
+    Reduces a stylesheet to whitelisted declarations, deduplicated by (selector, property, value).
+    Custom properties declared on :root are collapsed into a single JSON object at the top.
+    At-rule bodies such as @font-face and keyframe steps are skipped; rules nested in @media are kept.
+    """
+    root_vars: Dict[str, str] = {}
+    rules: Dict[str, List[str]] = {}
+    seen: Set[Tuple[str, str, str]] = set()
+    selectors: List[str] = []
+    pos = 0
+
+    for brace in _BRACE_RE.finditer(css):
+        text = css[pos:brace.start()]
+        pos = brace.end()
+        if brace.group() == "{":
+            # Anything before the last ';' belongs to the enclosing block, not this selector.
+            selectors.append(text.rsplit(";", 1)[-1].strip())
+            continue
+        if not selectors:
+            continue
+        selector = selectors.pop()
+        if not text.strip() or selector.startswith("@") or any("keyframes" in outer for outer in selectors):
+            continue
+        for declaration in text.split(";"):
+            prop, sep, value = declaration.partition(":")
+            if not sep:
+                continue
+            prop = prop.strip().lower()
+            value = value.strip()
+            if not value:
+                continue
+            if prop.startswith("--"):
+                if selector == ":root":
+                    root_vars[prop] = value
+                continue
+            if not _KEEP_PROPERTY_RE.match(prop) or "url(" in value:
+                continue
+            key = (selector, prop, value)
+            if key in seen:
+                continue
+            seen.add(key)
+            rules.setdefault(selector, []).append(f"{prop}:{value}")
+
+    lines = []
+    if root_vars:
+        lines.append(f":root variables: {json.dumps(root_vars, separators=(',', ':'))}")
+    lines.extend(f"{selector}{{{';'.join(declarations)}}}" for selector, declarations in rules.items())
+    return "\n".join(lines)
@@ -1,7 +1,14 @@
 import os
 import smtplib
+import weakref
 from email.mime.text import MIMEText
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+def _quit(server: smtplib.SMTP) -> None:
+    try:
+        server.quit()
+    except (smtplib.SMTPException, OSError):
+        server.close()
 
 class EmailSenderTool:
     def __init__(self):
@@ -10,6 +17,34 @@ class EmailSenderTool:
         self.smtp_port = int(os.getenv("SMTP_PORT", 587))
         self.smtp_user = os.getenv("SMTP_USERNAME")
         self.smtp_password = os.getenv("SMTP_PASSWORD")
+        # Authenticated connection reused across run() calls; opened on first send. An SMTP session
+        # is not thread-safe, so concurrent senders should each use their own EmailSenderTool.
+        self._server: Optional[smtplib.SMTP] = None
+        # Quits the open connection when the tool is garbage-collected or the interpreter exits,
+        # without keeping the tool itself alive.
+        self._finalizer: Optional[weakref.finalize] = None
+
+    def _connect(self) -> smtplib.SMTP:
+        self.close()
+        server = smtplib.SMTP(self.smtp_host, self.smtp_port)
+        try:
+            server.starttls()  # Secure the connection
+            server.login(self.smtp_user, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+        self._finalizer = weakref.finalize(self, _quit, server)
+        return server
+
+    def close(self) -> None:
+        """
+        Closes the pooled SMTP connection, if one is open.
+        """
+        finalizer, self._finalizer = self._finalizer, None
+        self._server = None
+        if finalizer is not None:
+            finalizer()
 
     def is_available(self) -> bool:
         """
@@ -39,10 +74,11 @@ class EmailSenderTool:
         msg["To"] = to_email
 
         try:
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()  # Secure the connection
-                server.login(self.smtp_user, self.smtp_password)
-                server.send_message(msg)
+            try:
+                (self._server or self._connect()).send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # The pooled connection timed out or was dropped; reconnect once and retry.
+                self._connect().send_message(msg)
             return {"status": "success", "message": "Email sent successfully."}
         except Exception as e:
             return {"status": "error", "message": f"Failed to send email: {e}"}
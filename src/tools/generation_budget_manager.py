@@ -1,8 +1,12 @@
 import json
 import os
+import threading
 from datetime import datetime, timedelta, date
 import src.config as config
 
+# Serializes read-modify-write updates of the budget file when posts run concurrently.
+_budget_lock = threading.RLock()
+
 # Global variable to store API_COSTS, loaded once
 API_COSTS = {}
 API_COSTS_FILE = os.path.join(
@@ -51,6 +55,10 @@ def check_and_update_budget():
     Checks if the daily budget needs to be reset.
     If the current date is past the reset date, it resets the daily spend.
     """
+    with _budget_lock:
+        return _check_and_update_budget()
+
+def _check_and_update_budget():
     state = get_budget_state()
     today_str = str(date.today())
     
@@ -109,16 +117,17 @@ def can_generate(cost: float):
 
 def record_generation(cost: float, tool_name: str):
     """Records a new generation and its cost."""
-    state = check_and_update_budget()
-    
-    state["daily_spend"] += cost
-    state["generations"].append({
-        "timestamp": datetime.now().isoformat(),
-        "tool": tool_name,
-        "cost": cost
-    })
-    
-    save_budget_state(state)
+    with _budget_lock:
+        state = check_and_update_budget()
+        
+        state["daily_spend"] += cost
+        state["generations"].append({
+            "timestamp": datetime.now().isoformat(),
+            "tool": tool_name,
+            "cost": cost
+        })
+        
+        save_budget_state(state)
     print(f"Recorded generation from '{tool_name}' with cost ${cost:.4f}.")
 
 def get_budget_status():
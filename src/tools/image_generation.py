@@ -16,6 +16,7 @@ from ..agents.photographic_stylist import PhotographicStylist
 
 # NEW Gemini Imports
 from google import genai
+from ..utils.clients import get_genai_client
 # from google.genai import Image as GenaiImage # REMOVED: Problematic import
 from io import BytesIO
 
@@ -116,7 +117,7 @@ def generate_image_with_gemini(prompt: str, campaign_dir: str, reference_image_p
     print(f"This Gemini image generation will cost ${cost:.4f}.")
     
     try:
-        client: genai.Client = genai.Client(api_key=api_key)
+        client: genai.Client = get_genai_client()
         
         # Prepare the prompt content
         content: List[Union[str, PILImage]] = [prompt] # Use PILImage for type hinting
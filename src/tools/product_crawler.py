@@ -4,19 +4,13 @@ import time
 from urllib.parse import urljoin, urlparse
 import requests
 from bs4 import BeautifulSoup
-from dotenv import load_dotenv
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_google_genai import ChatGoogleGenerativeAI
+from src.bootstrap import ensure_env
+from src.agents._llm import get_llm
 from src.config import PRODUCT_DIR
 
-load_dotenv()
-
-# Ensure GOOGLE_API_KEY is set as an environment variable
-if not os.getenv("GOOGLE_API_KEY"):
-    raise ValueError("GOOGLE_API_KEY environment variable not set.")
-
-llm = ChatGoogleGenerativeAI(model="gemini-2.5-pro", temperature=0.2)
+ensure_env()
 
 BASE_URL = "https://naturesdietpet.com"
 
@@ -75,6 +69,7 @@ def crawl_and_extract():
         return
 
     print(f"Found {len(product_links)} potential product pages.")
+    llm = get_llm("gemini-2.5-pro", 0.2)
     
     for link in product_links:
         print(f"Processing: {link}")
@@ -0,0 +1,31 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+@dataclass(frozen=True)
+class CampaignPaths:
+    """
+    Resolved paths of the files a campaign directory holds, so agents don't rebuild them by name.
+    """
+    campaign_dir: str
+    goal: str
+    research: str
+    content_final: str
+    specs_final: str
+    image_md: str
+    email_html: str
+
+@lru_cache(maxsize=64)
+def campaign_paths(campaign_dir: str) -> CampaignPaths:
+    """
+    Returns the CampaignPaths for campaign_dir, built once per directory.
+    """
+    return CampaignPaths(
+        campaign_dir=campaign_dir,
+        goal=os.path.join(campaign_dir, "campaign_goal.md"),
+        research=os.path.join(campaign_dir, "research_context.md"),
+        content_final=os.path.join(campaign_dir, "marketing_content_FINAL.md"),
+        specs_final=os.path.join(campaign_dir, "design_specs_FINAL.md"),
+        image_md=os.path.join(campaign_dir, "generated_image.md"),
+        email_html=os.path.join(campaign_dir, "email_campaign.html"),
+    )
@@ -0,0 +1,50 @@
+from __future__ import annotations
+import os
+from functools import lru_cache
+from typing import TYPE_CHECKING
+import httpx
+from google import genai
+from google.genai import types
+from src.bootstrap import ensure_env
+from src.config import GENAI_KEEPALIVE_EXPIRY_SECONDS, GENAI_MAX_KEEPALIVE_CONNECTIONS, GENAI_REQUEST_TIMEOUT_SECONDS
+
+if TYPE_CHECKING:
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+# Process-wide API clients, created on first use rather than at import time. Chat models are shared
+# the same way through src.agents._llm.get_llm.
+
+EMBEDDING_MODEL = "models/embedding-001"
+
+@lru_cache(maxsize=1)
+def get_genai_client() -> genai.Client:
+    """
+    Returns the shared google-genai client. GEMINI_API_KEY takes precedence over GOOGLE_API_KEY.
+    Its sync and async transports keep idle connections alive, so consecutive calls skip the TLS
+    handshake.
+    """
+    api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY or GOOGLE_API_KEY environment variable not set.")
+    pool_args = {
+        "limits": httpx.Limits(
+            max_keepalive_connections=GENAI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=GENAI_KEEPALIVE_EXPIRY_SECONDS,
+        )
+    }
+    http_options = types.HttpOptions(
+        timeout=int(GENAI_REQUEST_TIMEOUT_SECONDS * 1000),  # milliseconds
+        client_args=pool_args,
+        async_client_args=pool_args,
+    )
+    return genai.Client(api_key=api_key, http_options=http_options)
+
+@lru_cache(maxsize=1)
+def get_embeddings() -> GoogleGenerativeAIEmbeddings:
+    """
+    Returns the shared embedding model used to build and query the vector store.
+    """
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+    ensure_env()
+    return GoogleGenerativeAIEmbeddings(model=EMBEDDING_MODEL)
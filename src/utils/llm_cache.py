@@ -0,0 +1,77 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Optional
+from google.genai import types
+from src.config import PROJECT_ROOT
+
+# Exact-match store for Gemini responses produced through google-genai clients. LangChain-based
+# agents get the equivalent from the shared cache in src/agents/_cache.py.
+GEMINI_CACHE_PATH = os.getenv("GEMINI_CACHE_PATH", os.path.join(PROJECT_ROOT, ".gemini_response_cache.db"))
+
+_lock = threading.Lock()
+
+@lru_cache(maxsize=None)
+def _connection(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL, created_at REAL NOT NULL)"
+    )
+    conn.commit()
+    return conn
+
+def cache_key(model: str, prompt: str, system_instruction: Optional[str] = None) -> str:
+    return hashlib.sha256(f"{model}\x00{system_instruction or ''}\x00{prompt}".encode("utf-8")).hexdigest()
+
+class CachedGeminiClient:
+    """
+    Wraps a genai.Client so repeated (model, prompt) pairs are answered from a local SQLite store
+    instead of another generate_content round-trip.
+    """
+    def __init__(self, client, db_path: str = GEMINI_CACHE_PATH):
+        self.client = client
+        self.db_path = db_path
+
+    def _lookup(self, key: str) -> Optional[str]:
+        with _lock:
+            row = _connection(self.db_path).execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _store(self, key: str, model: str, response_text: str) -> None:
+        with _lock:
+            conn = _connection(self.db_path)
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, created_at) VALUES (?, ?, ?, ?)",
+                (key, model, response_text, time.time()),
+            )
+            conn.commit()
+
+    @staticmethod
+    def _config(system_instruction: Optional[str], cached_content: Optional[str]) -> Optional[types.GenerateContentConfig]:
+        if cached_content:
+            return types.GenerateContentConfig(cached_content=cached_content)
+        if system_instruction:
+            return types.GenerateContentConfig(system_instruction=system_instruction)
+        return None
+
+    def generate(self, model: str, prompt: str, system_instruction: Optional[str] = None, cached_content: Optional[str] = None) -> str:
+        """
+        Returns the response text for prompt, calling the API only on a cache miss.
+        system_instruction is sent as its own system turn so the static prefix stays byte-identical
+        across calls. If cached_content names a provider-side cache that already holds that
+        instruction, only the cache reference is sent. Empty responses are not cached.
+        """
+        key = cache_key(model, prompt, system_instruction)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        response_text = self.client.models.generate_content(
+            model=model, contents=[prompt], config=self._config(system_instruction, cached_content)
+        ).text
+        if response_text:
+            self._store(key, model, response_text)
+        return response_text
+
@@ -1,12 +1,20 @@
 import os
 import re
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+
+def _normalize(product_name: str) -> str:
+    # Case-insensitive and ignoring ®, so "Ready Raw® Beef" matches "ready raw beef".
+    return product_name.lower().replace('®', '')
 
 class ProductCatalog:
     def __init__(self, products_dir: str):
         self.products_dir = products_dir
         self.product_names: List[str] = []
         self._load_products()
+        # Normalized names are computed once here rather than on every lookup.
+        self._normalized_names: List[str] = [_normalize(name) for name in self.product_names]
+        self._normalized_set = set(self._normalized_names)
 
     def _load_products(self):
         """
@@ -37,24 +45,38 @@ class ProductCatalog:
         Checks if a product with the given name (case-insensitive) exists in the catalog.
         Also handles "Ready Raw® Beef (For Dogs)" vs "Ready Raw Beef (For Dogs)"
         """
-        query_name_lower = query_name.lower().replace('®', '')
-        for product_name in self.product_names:
-            if query_name_lower == product_name.lower().replace('®', ''):
-                return True
-        return False
+        return _normalize(query_name) in self._normalized_set
 
     def find_similar_product(self, query_name: str) -> Optional[str]:
         """
         Attempts to find a similar product name in the catalog based on the query,
         using a simple substring match (case-insensitive and ignoring ®).
         """
-        query_name_lower = query_name.lower().replace('®', '')
-        for product_name in self.product_names:
-            product_name_lower = product_name.lower().replace('®', '')
+        query_name_lower = _normalize(query_name)
+        for product_name, product_name_lower in zip(self.product_names, self._normalized_names):
             if query_name_lower in product_name_lower or product_name_lower in query_name_lower:
                 return product_name
         return None
 
+@lru_cache(maxsize=4)
+def _load_catalog(products_dir: str, dir_signature: Tuple[Tuple[str, int], ...]) -> ProductCatalog:
+    # dir_signature is part of the cache key so added, removed or edited product files trigger a reload.
+    return ProductCatalog(products_dir)
+
+def load_catalog(products_dir: str) -> ProductCatalog:
+    """
+    Returns the ProductCatalog for products_dir, reusing the parsed catalog while the directory's
+    markdown files are unchanged.
+    """
+    dir_signature: Tuple[Tuple[str, int], ...] = ()
+    if os.path.isdir(products_dir):
+        dir_signature = tuple(sorted(
+            (entry.name, entry.stat().st_mtime_ns)
+            for entry in os.scandir(products_dir)
+            if entry.name.endswith(".md")
+        ))
+    return _load_catalog(products_dir, dir_signature)
+
 if __name__ == "__main__":
     # Example usage:
     # Assuming the script is run from the project root